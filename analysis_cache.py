@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Caché de análisis por conversación
+Guarda el resultado del análisis de cada conversación (clave: id + update_time)
+para que un nuevo export solo re-analice lo nuevo o modificado
+"""
+
+import pickle
+import sqlite3
+from pathlib import Path
+
+# Incrementar cuando cambie el análisis por conversación para invalidar la caché
+CACHE_VERSION = 7
+
+
+class ConversationCache:
+    """Caché persistente (SQLite) de resultados de análisis por conversación"""
+
+    def __init__(self, path, signature=''):
+        """signature identifica las opciones del análisis (analizadores,
+        roles, motor de sentimientos); si cambia, la caché se descarta"""
+        self.path = Path(path)
+        self.version = f"{CACHE_VERSION}:{signature}" if signature else str(CACHE_VERSION)
+        self.conn = sqlite3.connect(str(self.path))
+        self.hits = 0
+        self.misses = 0
+        self._seen = set()
+        self._init_schema()
+
+    def _init_schema(self):
+        """Crea las tablas y descarta la caché si es de otra versión u opciones"""
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            self.conn.execute("DROP TABLE IF EXISTS conversations")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversations ("
+            "id TEXT PRIMARY KEY, update_time REAL, result BLOB)"
+        )
+        self.conn.commit()
+
+    def get(self, conv_id, update_time):
+        """Devuelve el resultado guardado si la conversación no cambió"""
+        self._seen.add(conv_id)
+        row = self.conn.execute(
+            "SELECT update_time, result FROM conversations WHERE id = ?", (conv_id,)
+        ).fetchone()
+        if row is not None and row[0] == update_time:
+            self.hits += 1
+            return pickle.loads(row[1])
+        self.misses += 1
+        return None
+
+    def put(self, conv_id, update_time, result):
+        """Guarda el resultado del análisis de una conversación"""
+        self._seen.add(conv_id)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+            (conv_id, update_time, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+
+    def prune(self):
+        """Elimina las conversaciones que ya no están en el export"""
+        stored = [row[0] for row in self.conn.execute("SELECT id FROM conversations")]
+        removed = [(conv_id,) for conv_id in stored if conv_id not in self._seen]
+        self.conn.executemany("DELETE FROM conversations WHERE id = ?", removed)
+        return len(removed)
+
+    def close(self):
+        """Confirma los cambios y cierra la base de datos"""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
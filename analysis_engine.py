@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Motor de análisis
+Recorre el export una sola vez y despacha eventos de conversación y de
+mensaje a los analizadores registrados (analyzers.py). parser.py y
+chatgpt_parser.py usan este mismo motor.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from analyzers import ANALYZERS, Analyzer, configured_analyzers
+from message_table import NAN
+from nlp_cache import open_nlp_cache
+from sentiment import configured_backend
+from streaming_stats import (LENGTH_BINS, SENTIMENT_BINS, STREAMING_TYPES, TOP_K_MODES, Distribution,
+                             SequenceSeries, SpaceSaving, configured_top_k)
+from text_matcher import scan_text_features
+from text_normalizer import MessageText, get_stop_words
+
+_HOOKS = ('start_conversation', 'message', 'end_conversation', 'finalize')
+
+
+def extract_text(content):
+    """Texto de un mensaje: sus partes de texto unidas, o content['text']
+
+    Las partes que no son texto (imágenes, audios, adjuntos) se ignoran.
+    """
+    if isinstance(content, str):
+        return content
+    if not isinstance(content, dict):
+        return ''
+    parts = content.get('parts')
+    if parts:
+        return '\n'.join(part for part in parts if isinstance(part, str))
+    text = content.get('text')
+    return text if isinstance(text, str) else ''
+
+
+class MessageEvent:
+    """Un mensaje con texto, normalizado una sola vez para todos los analizadores"""
+
+    __slots__ = ('role', 'create_time', 'text', 'sentiment', '_features')
+
+    def __init__(self, role, create_time, text):
+        self.role = role
+        self.create_time = create_time
+        self.text = text
+        self.sentiment = None
+        self._features = None
+
+    @property
+    def features(self):
+        """(URLs, emojis, hay_acentos) del texto, escaneado una sola vez"""
+        if self._features is None:
+            self._features = scan_text_features(self.text.text)
+        return self._features
+
+
+class ConversationEvent:
+    """Una conversación del export y los mensajes que pasaron el filtro"""
+
+    __slots__ = ('id', 'index', 'title', 'create_time', 'date', 'messages', 'message_count')
+
+    def __init__(self, conversation, index):
+        self.id = conversation.get('id', f'conv_{index}')
+        self.index = index
+        self.title = conversation.get('title', 'Sin título')
+        self.create_time = conversation.get('create_time') or None
+        self.date = datetime.fromtimestamp(self.create_time) if self.create_time else None
+        self.messages = []
+        self.message_count = 0
+
+
+class AnalysisEngine:
+    """Motor de un solo recorrido con analizadores enchufables
+
+    analyzers: nombres registrados en analyzers.ANALYZERS (en orden); None
+    usa los de DEFAULT_ANALYZERS que no estén desactivados en config.py.
+    roles: roles de autor a analizar (None para todos).
+    top_k: 'exact' (Counter) o 'approximate' (Space-Saving, memoria fija)
+    para los rankings de palabras, emojis, temas y términos técnicos.
+    """
+
+    def __init__(self, analyzers=None, roles=None, nlp=True, sentiment_backend=None, nlp_cache_path=None,
+                 top_k=None, top_k_capacity=None):
+        self.nlp = nlp
+        # Sin NLP no se analizan sentimientos ni se carga NLTK
+        self.sentiment_backend = (sentiment_backend or configured_backend()) if nlp else 'none'
+        self.roles = tuple(roles) if roles else None
+        self.nlp_cache_path = nlp_cache_path
+
+        configured_mode, configured_capacity = configured_top_k()
+        self.top_k = top_k or configured_mode
+        if self.top_k not in TOP_K_MODES:
+            raise ValueError(f"Modo de ranking desconocido: {self.top_k}")
+        self.top_k_capacity = top_k_capacity or configured_capacity
+
+        names = tuple(analyzers or configured_analyzers())
+        unknown = [name for name in names if name not in ANALYZERS]
+        if unknown:
+            raise ValueError(f"Analizadores desconocidos: {', '.join(unknown)}")
+        self.analyzers = [ANALYZERS[name](self) for name in names]
+
+        # Solo se despachan los eventos que cada analizador implementa
+        self._hooks = {
+            hook: [getattr(analyzer, hook) for analyzer in self.analyzers
+                   if getattr(type(analyzer), hook) is not getattr(Analyzer, hook)]
+            for hook in _HOOKS
+        }
+
+    def options(self):
+        """Opciones para reconstruir el motor en un proceso hijo"""
+        return {'analyzers': [analyzer.name for analyzer in self.analyzers], 'roles': self.roles,
+                'nlp': self.nlp, 'sentiment_backend': self.sentiment_backend,
+                'nlp_cache_path': self.nlp_cache_path, 'top_k': self.top_k,
+                'top_k_capacity': self.top_k_capacity}
+
+    def instrument(self, profiler):
+        """Mide cada evento de cada analizador con profiler (modo --profile)"""
+        for hook, callbacks in self._hooks.items():
+            self._hooks[hook] = [profiler.timed(f"analyzer.{callback.__self__.name}.{hook}", callback)
+                                 for callback in callbacks]
+
+    def analyzer(self, name):
+        """Instancia del analizador registrado con ese nombre (o None)"""
+        for analyzer in self.analyzers:
+            if analyzer.name == name:
+                return analyzer
+        return None
+
+    @property
+    def nlp_cache(self):
+        """Caché de resultados NLP (None si no está activada)"""
+        if not self.nlp_cache_path:
+            return None
+        return open_nlp_cache(self.nlp_cache_path)
+
+    @property
+    def stop_words(self):
+        """Stopwords de NLTK (o las básicas si NLP está desactivado)"""
+        return get_stop_words(use_nltk=self.nlp)
+
+    def ranking(self):
+        """Contador de un ranking según el modo top_k"""
+        if self.top_k == 'approximate':
+            return SpaceSaving(self.top_k_capacity)
+        return Counter()
+
+    def initial_stats(self):
+        """Inicializa la estructura de estadísticas"""
+        return {
+            # Estadísticas básicas
+            'total_conversations': 0,
+            'total_messages': 0,
+            'total_words': 0,
+            'total_characters': 0,
+
+            # Actividad temporal
+            'daily_activity': defaultdict(int),
+            'hourly_activity': defaultdict(int),
+            'monthly_activity': defaultdict(int),
+            'weekly_activity': defaultdict(int),
+            'yearly_activity': defaultdict(int),
+
+            # Análisis de contenido
+            'word_frequency': self.ranking(),
+            'conversation_lengths': [],
+            'topics': self.ranking(),
+            'languages': Counter(),
+            'message_types': Counter(),
+            'conversation_titles': [],
+
+            # Análisis de sentimientos (acumuladores de memoria constante)
+            'sentiment_scores': SequenceSeries(),
+            'sentiment_distribution': Distribution(SENTIMENT_BINS),
+            'positive_messages': 0,
+            'negative_messages': 0,
+            'neutral_messages': 0,
+            'sentiment_agreement': defaultdict(int),
+
+            # Patrones de uso
+            'message_length_stats': Distribution(LENGTH_BINS, quantiles=True),
+            'avg_message_length': 0,
+            'avg_words_per_message': 0,
+            'longest_message': 0,
+            'shortest_message': float('inf'),
+            'conversation_gaps': None,
+
+            # Estadísticas temporales
+            'first_conversation': None,
+            'last_conversation': None,
+            'avg_conversation_length': 0,
+            'longest_conversation': 0,
+            'shortest_conversation': float('inf'),
+            'most_active_day': None,
+            'most_active_hour': None,
+            'most_active_month': None,
+
+            # Análisis avanzado
+            'question_patterns': Counter(),
+            'code_blocks': 0,
+            'urls_shared': 0,
+            'emojis_used': self.ranking(),
+            'technical_terms': self.ranking(),
+            'programming_languages': self.ranking(),
+
+            # Métricas de productividad
+            'conversations_per_day': 0,
+            'messages_per_day': 0,
+            'words_per_day': 0,
+            'peak_usage_periods': [],
+            'usage_trends': [],
+
+            # Análisis de comportamiento
+            'session_lengths': [],
+            'break_patterns': [],
+            'engagement_levels': [],
+            'topic_evolution': defaultdict(list),
+
+            # Estadísticas de archivos
+            'files_shared': 0,
+            'image_files': 0,
+            'document_files': 0,
+            'code_files': 0,
+
+            # Análisis de calidad
+            'message_quality_scores': [],
+            'conversation_complexity': [],
+            'interaction_patterns': defaultdict(int),
+
+            # Datos para visualizaciones
+            'heatmap_data': defaultdict(lambda: defaultdict(int)),
+            'network_data': defaultdict(list),
+            'timeline_data': [],
+            'github_style_data': [],
+            'correlation_data': defaultdict(float),
+
+            # Análisis de días activos/inactivos
+            'days_analysis': {},
+            'cumulative_data': []
+        }
+
+    def process_conversation(self, conversation, index, stats, table):
+        """Recorre una conversación despachando sus eventos a los analizadores
+
+        Las longitudes y sentimientos de los mensajes se suman por conversación
+        en la tabla columnar.
+        """
+        conv = ConversationEvent(conversation, index)
+        for hook in self._hooks['start_conversation']:
+            hook(conv, stats)
+
+        message_hooks = self._hooks['message']
+        roles = self.roles
+        for msg_data in conversation.get('mapping', {}).values():
+            message = msg_data.get('message')
+            if not message:
+                continue
+            role = (message.get('author') or {}).get('role', 'unknown')
+            if roles is not None and role not in roles:
+                continue
+            text = extract_text(message.get('content', {}))
+            if not text:
+                continue
+
+            msg = MessageEvent(role, message.get('create_time'), MessageText(text))
+            conv.messages.append(msg)
+            stats['total_messages'] += 1
+            stats['total_words'] += msg.text.word_count
+            stats['total_characters'] += msg.text.char_length
+            stats['message_length_stats'].add(msg.text.char_length)
+
+            for hook in message_hooks:
+                hook(msg, conv, stats)
+
+        conv.message_count = len(conv.messages)
+        for hook in self._hooks['end_conversation']:
+            hook(conv, stats)
+
+        # Filas de la tabla (con los sentimientos ya calculados)
+        row = table.add_conversation(conv.create_time)
+        for msg in conv.messages:
+            table.add_message(row, msg.text.char_length, msg.text.word_count,
+                              NAN if msg.sentiment is None else msg.sentiment)
+        table.set_message_count(row, conv.message_count)
+
+        # Estadísticas de conversación
+        stats['conversation_lengths'].append(conv.message_count)
+        stats['conversation_titles'].append(conv.title)
+        if conv.message_count > stats['longest_conversation']:
+            stats['longest_conversation'] = conv.message_count
+        if conv.message_count < stats['shortest_conversation']:
+            stats['shortest_conversation'] = conv.message_count
+
+    def finalize(self, stats, table):
+        """Calcula las estadísticas finales (una vez fusionados los parciales)"""
+        stats['total_conversations'] = len(stats['conversation_lengths'])
+
+        lengths = stats['message_length_stats']
+        if lengths.count:
+            stats['avg_message_length'] = lengths.stats.mean
+            stats['longest_message'] = lengths.stats.max
+            stats['shortest_message'] = lengths.stats.min
+            stats['avg_words_per_message'] = stats['total_words'] / lengths.count
+            for name, value in lengths.percentiles().items():
+                stats[f'message_length_{name}'] = value
+
+        if table.num_conversations:
+            stats['avg_conversation_length'] = table.mean_conversation_length()
+
+        for key in ('shortest_conversation', 'shortest_message'):
+            if stats[key] == float('inf'):
+                stats[key] = 0
+
+        for hook in self._hooks['finalize']:
+            hook(stats, table)
+
+        # Convertir acumuladores y defaultdicts a dicts/listas para JSON
+        for key, value in stats.items():
+            if isinstance(value, STREAMING_TYPES):
+                stats[key] = value.to_dict()
+            elif isinstance(value, defaultdict):
+                stats[key] = {k: dict(v) if isinstance(v, dict) else v for k, v in value.items()}
+        return stats
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Analizadores del motor de análisis
+Cada analizador se suscribe a los eventos de conversación y de mensaje del
+recorrido único del export y calcula sus propias métricas. Para agregar una
+métrica basta con registrar un analizador nuevo con @register_analyzer.
+"""
+
+import math
+import statistics
+
+from daily_activity import DailyActivity
+from message_table import correlation
+from nlp_support import get_textblob
+from sentiment import get_sentiment_lexicon, sentiment_bucket
+from settings import config_section
+from streaming_stats import GAP_BINS, Distribution, SpaceSaving
+from text_matcher import get_term_matcher
+
+# Con el motor 'lexicon', uno de cada N mensajes se compara con TextBlob
+AGREEMENT_SAMPLE_EVERY = 50
+
+# Elementos que se conservan de cada ranking en las estadísticas finales
+TOP_LIMITS = {
+    'word_frequency': 100,
+    'topics': 50,
+    'technical_terms': 30,
+    'programming_languages': 20,
+    'emojis_used': 20,
+}
+
+# Un mes es "pico" si supera en este factor a la media mensual
+PEAK_USAGE_FACTOR = 1.5
+
+ANALYZERS = {}
+
+
+def register_analyzer(name):
+    """Decorador que registra una clase de analizador con un nombre"""
+    def decorator(cls):
+        cls.name = name
+        ANALYZERS[name] = cls
+        return cls
+    return decorator
+
+
+class Analyzer:
+    """Analizador base: los eventos que no se redefinen no se despachan
+
+    Eventos (en orden, dentro de un único recorrido del export):
+    start_conversation(conv, stats), message(msg, conv, stats),
+    end_conversation(conv, stats) y, tras fusionar todo, finalize(stats, table).
+    """
+
+    name = None
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def start_conversation(self, conv, stats):
+        pass
+
+    def message(self, msg, conv, stats):
+        pass
+
+    def end_conversation(self, conv, stats):
+        pass
+
+    def finalize(self, stats, table):
+        pass
+
+
+def _top(stats, key):
+    """Deja solo el top del ranking; en modo aproximado anota sus cotas de error"""
+    counter = stats[key]
+    limit = TOP_LIMITS[key]
+    if isinstance(counter, SpaceSaving):
+        stats.setdefault('top_k_error_bounds', {})[key] = counter.error_bounds(limit)
+    stats[key] = dict(counter.most_common(limit))
+
+
+@register_analyzer('temporal')
+class TemporalAnalyzer(Analyzer):
+    """Actividad por día/hora/mes, rachas, calendario y productividad"""
+
+    def start_conversation(self, conv, stats):
+        date = conv.date
+        if date is None:
+            return
+        stats['daily_activity'][date.strftime('%Y-%m-%d')] += 1
+        stats['hourly_activity'][date.hour] += 1
+        stats['monthly_activity'][date.strftime('%Y-%m')] += 1
+        stats['weekly_activity'][date.strftime('%Y-W%U')] += 1
+        stats['yearly_activity'][date.year] += 1
+
+        # Heatmap data (día de la semana vs hora)
+        stats['heatmap_data'][date.weekday()][date.hour] += 1
+
+    def finalize(self, stats, table):
+        daily_activity = stats['daily_activity']
+        if daily_activity:
+            stats['most_active_day'] = max(daily_activity, key=daily_activity.get)
+        if stats['hourly_activity']:
+            stats['most_active_hour'] = max(stats['hourly_activity'], key=stats['hourly_activity'].get)
+        if stats['monthly_activity']:
+            stats['most_active_month'] = max(stats['monthly_activity'], key=stats['monthly_activity'].get)
+
+        # Horas entre conversaciones consecutivas (en orden cronológico), como
+        # distribución: una lista tendría un valor por conversación
+        timestamps = sorted(ts for ts in table.conv_create_time if not math.isnan(ts))
+        gaps = Distribution(GAP_BINS, quantiles=True)
+        for previous, current in zip(timestamps, timestamps[1:]):
+            gaps.add((current - previous) / 3600)
+        stats['conversation_gaps'] = gaps
+
+        dates = table.date_range()
+        if not dates:
+            return
+        first_date, last_date = dates
+        stats['first_conversation'] = first_date.isoformat()
+        stats['last_conversation'] = last_date.isoformat()
+
+        # Métricas de productividad
+        date_range = (last_date - first_date).days
+        if date_range > 0:
+            stats['conversations_per_day'] = stats['total_conversations'] / date_range
+            stats['messages_per_day'] = stats['total_messages'] / date_range
+            stats['words_per_day'] = stats['total_words'] / date_range
+
+        # Tendencia de uso por mes y períodos pico
+        stats['usage_trends'] = sorted(stats['monthly_activity'].items())
+        if stats['usage_trends'] and len(timestamps) > 1:
+            avg_monthly = statistics.mean(count for _, count in stats['usage_trends'])
+            stats['peak_usage_periods'] = [{
+                'month': month,
+                'count': count,
+                'intensity': count / avg_monthly
+            } for month, count in stats['usage_trends'] if count > avg_monthly * PEAK_USAGE_FACTOR]
+
+        activity = DailyActivity(daily_activity, first_date, last_date)
+        stats['days_analysis'] = summarize_active_days(activity)
+        stats['github_style_data'] = activity.github_calendar()
+        stats['timeline_data'] = activity.timeline()
+        # Mensajes y palabras acumuladas aún no se calculan por día
+        stats['cumulative_data'] = activity.cumulative({'cumulative_messages': 0, 'cumulative_words': 0})
+
+
+def summarize_active_days(activity):
+    """Días activos/inactivos y rachas de un DailyActivity"""
+    summary = activity.active_days_summary()
+    streaks = activity.streaks()
+    summary.update({
+        'longest_active_streak': streaks['longest_active'],
+        'longest_inactive_streak': streaks['longest_inactive'],
+        'average_active_streak': streaks['avg_active'],
+        'average_inactive_streak': streaks['avg_inactive'],
+        'streaks': streaks['all_streaks'],
+        'weekday_totals': activity.weekday_totals()
+    })
+    return summary
+
+
+@register_analyzer('lexical')
+class LexicalAnalyzer(Analyzer):
+    """Frecuencia de palabras, idioma, temas, términos técnicos y lenguajes"""
+
+    def message(self, msg, conv, stats):
+        text = msg.text
+        stats['word_frequency'].update(text.content_tokens(stop_words=self.engine.stop_words))
+
+        # Idioma: los acentos españoles salen del escaneo compartido del mensaje
+        stats['languages']['español' if msg.features[2] else 'inglés'] += 1
+
+        # Temas, términos técnicos, lenguajes y patrones de interacción en una pasada
+        for category, label in get_term_matcher().match_tokens(text.tokens):
+            stats[category][label] += 1
+
+    def finalize(self, stats, table):
+        for key in ('word_frequency', 'topics', 'technical_terms', 'programming_languages'):
+            _top(stats, key)
+        stats['languages'] = dict(stats['languages'])
+        stats['interaction_patterns'] = dict(stats['interaction_patterns'])
+
+
+@register_analyzer('sentiment')
+class SentimentAnalyzer(Analyzer):
+    """Polaridad de cada mensaje, puntuada en lote al cerrar la conversación"""
+
+    def end_conversation(self, conv, stats):
+        scores = self.score([msg.text for msg in conv.messages], stats)
+        if not scores:
+            return
+        for msg, score in zip(conv.messages, scores):
+            msg.sentiment = score
+            stats[f"{sentiment_bucket(score)}_messages"] += 1
+            stats['sentiment_distribution'].add(score)
+
+    def score(self, texts, stats):
+        """Puntúa un lote de mensajes (MessageText) con el motor configurado"""
+        backend = self.engine.sentiment_backend
+        if backend == 'none' or not texts:
+            return []
+        if backend != 'lexicon':
+            return [self.textblob_polarity(text.text) for text in texts]
+
+        scores = get_sentiment_lexicon().score_batch([text.tokens for text in texts])
+
+        # Comparar una muestra con TextBlob para medir la concordancia
+        if get_textblob() is not None:
+            agreement = stats['sentiment_agreement']
+            for text, score in zip(texts, scores):
+                agreement['seen'] += 1
+                if agreement['seen'] % AGREEMENT_SAMPLE_EVERY == 0:
+                    agreement['sampled'] += 1
+                    if sentiment_bucket(score) == sentiment_bucket(self.textblob_polarity(text.text)):
+                        agreement['agreed'] += 1
+        return scores
+
+    def textblob_polarity(self, text):
+        """Polaridad de TextBlob, con la caché NLP si está activada"""
+        TextBlob = get_textblob()
+        if TextBlob is None or not text.strip():
+            return 0.0
+
+        cache = self.engine.nlp_cache
+        if cache:
+            cached = cache.get('sentiment', text)
+            if cached is not None:
+                return cached
+
+        try:
+            polarity = TextBlob(text).sentiment.polarity
+        except Exception:
+            return 0.0
+
+        if cache:
+            cache.put('sentiment', text, polarity)
+        return polarity
+
+    def finalize(self, stats, table):
+        distribution = stats['sentiment_distribution']
+        if distribution.count:
+            stats['avg_sentiment'] = distribution.stats.mean
+            stats['sentiment_std'] = distribution.stats.std
+
+        # La serie sale de las sumas por conversación de la tabla, ya en su
+        # orden final: los parciales de los procesos hijos y de la caché
+        # incremental no guardan posiciones, que cambian si el export agrega
+        # conversaciones al principio
+        series = stats['sentiment_scores']
+        for position, (total, count) in enumerate(zip(table.conv_sentiment_sum, table.conv_scored_count)):
+            if count:
+                series.add(total, position, count)
+
+        # Motor de sentimientos usado y concordancia con TextBlob
+        agreement = stats['sentiment_agreement']
+        stats['sentiment_agreement'] = dict(agreement)
+        stats['sentiment_engine'] = {
+            'backend': self.engine.sentiment_backend,
+            'agreement_sample_size': agreement['sampled'],
+            'agreement_with_textblob': round(agreement['agreed'] / agreement['sampled'], 4) if agreement['sampled'] else None
+        }
+
+
+@register_analyzer('code_urls')
+class CodeUrlAnalyzer(Analyzer):
+    """Preguntas, bloques de código y URLs compartidas"""
+
+    def message(self, msg, conv, stats):
+        text = msg.text.text
+        if '?' in text:
+            stats['question_patterns']['preguntas'] += 1
+        if '```' in text or 'def ' in text or 'function ' in text:
+            stats['code_blocks'] += 1
+        stats['urls_shared'] += msg.features[0]
+
+    def finalize(self, stats, table):
+        stats['question_patterns'] = dict(stats['question_patterns'])
+
+
+@register_analyzer('emoji')
+class EmojiAnalyzer(Analyzer):
+    """Emojis más usados"""
+
+    def message(self, msg, conv, stats):
+        for emoji in msg.features[1]:
+            stats['emojis_used'][emoji] += 1
+
+    def finalize(self, stats, table):
+        _top(stats, 'emojis_used')
+
+
+@register_analyzer('complexity')
+class ComplexityAnalyzer(Analyzer):
+    """Complejidad y sentimiento por conversación, y sus correlaciones
+
+    Necesita los sentimientos: debe ir después del analizador 'sentiment'.
+    """
+
+    def end_conversation(self, conv, stats):
+        scores = [msg.sentiment for msg in conv.messages if msg.sentiment is not None]
+        if not scores:
+            return
+        stats['conversation_complexity'].append({
+            'title': conv.title,
+            'sentiment': statistics.mean(scores),
+            'message_count': conv.message_count,
+            'word_count': sum(msg.text.word_count for msg in conv.messages),
+            'avg_message_length': statistics.mean(msg.text.char_length for msg in conv.messages)
+        })
+
+    def finalize(self, stats, table):
+        for conv in stats['conversation_complexity']:
+            conv['sentiment_category'] = sentiment_bucket(conv['sentiment'])
+        stats['correlation_data'] = calculate_correlations(stats, table)
+
+
+def calculate_correlations(stats, table=None):
+    """Calcula correlaciones entre diferentes métricas
+
+    Con la tabla de mensajes los agregados por conversación se calculan sobre
+    columnas; sin ella se usan los de conversation_complexity.
+    """
+    correlations = {}
+
+    if table is not None:
+        aggregates = table.conversation_aggregates()
+    elif stats['conversation_complexity']:
+        aggregates = {key: [conv[key] for conv in stats['conversation_complexity']]
+                      for key in ('message_count', 'word_count', 'avg_message_length', 'sentiment')}
+    else:
+        return correlations
+
+    # Correlación entre longitud de mensaje y sentimiento
+    value = correlation(aggregates['avg_message_length'], aggregates['sentiment'])
+    if value is not None:
+        correlations['message_length_sentiment'] = value
+
+    # Correlación entre número de mensajes y complejidad
+    value = correlation(aggregates['message_count'], aggregates['word_count'])
+    if value is not None:
+        correlations['messages_words'] = value
+
+    return correlations
+
+
+# Orden por defecto: 'complexity' usa los sentimientos de 'sentiment'
+DEFAULT_ANALYZERS = ('temporal', 'lexical', 'sentiment', 'code_urls', 'emoji', 'complexity')
+
+# Analizadores que apaga cada opción enable_* de ANALYSIS_CONFIG
+ANALYZER_TOGGLES = {
+    'enable_sentiment_analysis': ('sentiment', 'complexity'),
+    'enable_advanced_analysis': ('code_urls', 'emoji', 'complexity'),
+}
+
+
+def configured_analyzers():
+    """DEFAULT_ANALYZERS sin los desactivados en ANALYSIS_CONFIG (config.py)"""
+    config = config_section('ANALYSIS_CONFIG')
+    disabled = {name for option, names in ANALYZER_TOGGLES.items()
+                if not config.get(option, True) for name in names}
+    return tuple(name for name in DEFAULT_ANALYZERS if name not in disabled)
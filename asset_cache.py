@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Caché de variantes comprimidas
+Guarda en memoria las versiones gzip/brotli de los archivos que sirve el
+servidor; una entrada se invalida cuando cambia el mtime o el tamaño del archivo
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+# Tipos que vale la pena comprimir (el resto ya viene comprimido: audio, imágenes)
+COMPRESSIBLE_TYPES = frozenset([
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'
+])
+
+# Archivos más chicos no ganan nada; más grandes se sirven sin comprimir
+MIN_COMPRESS_SIZE = 1024
+MAX_COMPRESS_SIZE = 64 * 1024 * 1024
+
+# Memoria total para las variantes (se descartan las menos usadas)
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+def _load_brotli():
+    """Módulo brotli, o None si no está instalado"""
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+
+def supported_encodings():
+    """Codificaciones disponibles, en orden de preferencia"""
+    return ('br', 'gzip') if _load_brotli() else ('gzip',)
+
+
+def is_compressible(content_type, size):
+    """Indica si conviene comprimir un archivo de ese tipo y tamaño"""
+    if not MIN_COMPRESS_SIZE <= size <= MAX_COMPRESS_SIZE:
+        return False
+    content_type = content_type.split(';', 1)[0].strip()
+    return content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+
+
+def choose_encoding(accept_encoding):
+    """Primera codificación soportada que acepta el cliente (o None)"""
+    accepted = set()
+    for token in (accept_encoding or '').split(','):
+        name, _, params = token.partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return _load_brotli().compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+class CompressedAssetCache:
+    """Variantes comprimidas en memoria, con límite de bytes (LRU)"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, encoding, stat):
+        """Devuelve el contenido de path comprimido con encoding
+
+        stat es el os.stat del archivo: si su mtime o tamaño no coinciden con
+        los de la entrada guardada, se vuelve a comprimir.
+        """
+        key = (str(path), encoding)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        with open(path, 'rb') as f:
+            data = compress(f.read(), encoding)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            if len(data) <= self.max_bytes:
+                self._entries[key] = (version, data)
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
+
+
+_cache = None
+
+
+def get_asset_cache():
+    """Caché compartida por todos los hilos del servidor"""
+    global _cache
+    if _cache is None:
+        _cache = CompressedAssetCache()
+    return _cache
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Análisis por lotes de muchos exports
+Analiza cada export de un directorio (ZIPs o carpetas con conversations.json)
+en un pool de procesos compartido: cada proceso carga NLTK, TextBlob y los
+términos una sola vez y analiza un usuario tras otro. Cada usuario tiene su
+directorio de salida y batch_manifest.json resume tiempos y fallos.
+"""
+
+import json
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+from export_archive import CONVERSATIONS_NAME, find_export_zip, is_export_zip
+
+MANIFEST_NAME = "batch_manifest.json"
+LOG_NAME = "analysis.log"
+OUTPUT_NAME = "chatgpt_stats.json"
+CACHE_NAME = "chatgpt_stats.cache.sqlite"
+
+
+def _user_name(name, taken):
+    """Nombre de directorio seguro y único para un export"""
+    base = re.sub(r'[^\w.-]+', '_', name).strip('._') or 'export'
+    candidate = base
+    suffix = 2
+    while candidate in taken:
+        candidate = f"{base}-{suffix}"
+        suffix += 1
+    taken.add(candidate)
+    return candidate
+
+
+def find_exports(input_dir):
+    """[(usuario, ruta), ...] con los exports de input_dir en orden alfabético
+
+    Cuenta cada ZIP de export y cada carpeta con conversations.json o con un
+    ZIP de export adentro; el usuario es el nombre del ZIP o de la carpeta.
+    """
+    exports = []
+    taken = set()
+    for path in sorted(Path(input_dir).iterdir()):
+        if path.is_dir():
+            if not (path / CONVERSATIONS_NAME).exists() and not find_export_zip(path):
+                continue
+            name = path.name
+        elif is_export_zip(path):
+            name = path.stem
+        else:
+            continue
+        exports.append((_user_name(name, taken), path))
+    return exports
+
+
+def _init_worker(nlp):
+    """Carga una vez por proceso lo que comparten todos los usuarios"""
+    from text_matcher import get_term_matcher
+    from text_normalizer import get_stop_words
+
+    get_stop_words(use_nltk=nlp)
+    get_term_matcher()
+    if nlp:
+        from nlp_support import get_textblob
+        get_textblob()
+
+
+def analyze_export(user, source, output_dir, options):
+    """Analiza un export en el proceso actual y devuelve su entrada del manifiesto
+
+    La salida del parser va a analysis.log en el directorio del usuario; un
+    error deja la traza en ese log y la entrada con status 'failed'.
+    """
+    source = Path(source)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    entry = {'user': user, 'source': str(source), 'output_dir': str(output_dir),
+             'log': str(output_dir / LOG_NAME), 'pid': os.getpid()}
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    with open(output_dir / LOG_NAME, 'w', encoding='utf-8') as log, redirect_stdout(log):
+        try:
+            from chatgpt_parser import ChatGPTParser
+
+            is_zip = source.is_file()
+            parser = ChatGPTParser(source.parent if is_zip else source, stream=True,
+                                   zip_path=source if is_zip else None, output_dir=output_dir,
+                                   cache_path=output_dir / CACHE_NAME if options.get('incremental') else None,
+                                   nlp=options.get('nlp', True), search_index=options.get('search_index'),
+                                   top_k=options.get('top_k'))
+            stats = parser.process_conversations()
+            output_path = parser.save_stats(OUTPUT_NAME, options.get('compress'))
+            entry.update({
+                'status': 'ok',
+                'output': str(output_path),
+                'conversations': stats['total_conversations'],
+                'messages': stats['total_messages']
+            })
+        except Exception as e:
+            traceback.print_exc(file=log)
+            entry.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+
+    entry['seconds'] = round(time.perf_counter() - wall, 3)
+    entry['cpu_seconds'] = round(time.process_time() - cpu, 3)
+    return entry
+
+
+def write_manifest(manifest, path):
+    """Guarda el manifiesto de forma atómica (se actualiza tras cada usuario)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def run_batch(input_dir, output_dir, jobs=None, options=None):
+    """Analiza todos los exports de input_dir con a lo sumo jobs procesos
+
+    options: nlp, incremental, search_index, compress y top_k (los mismos de
+    chatgpt_parser.py). Devuelve el manifiesto.
+    """
+    options = dict(options or {})
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+
+    exports = find_exports(input_dir)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(exports) or 1))
+    manifest = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'input_dir': str(input_dir),
+        'output_dir': str(output_dir),
+        'jobs': jobs,
+        'options': options,
+        'users': []
+    }
+    print(f"👥 {len(exports)} exports encontrados en {input_dir}, {jobs} procesos")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(options.get('nlp', True),)) as executor:
+        futures = {
+            executor.submit(analyze_export, user, str(path), str(output_dir / user), options): (user, path)
+            for user, path in exports
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            user, path = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                # El proceso hijo murió (p. ej. sin memoria): el pool ya no sirve
+                entry = {'user': user, 'source': str(path), 'output_dir': str(output_dir / user),
+                         'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+            manifest['users'].append(entry)
+            icon = '✅' if entry['status'] == 'ok' else '❌'
+            detail = (f"{entry.get('conversations', 0)} conversaciones en {entry.get('seconds', 0):.1f}s"
+                      if entry['status'] == 'ok' else entry['error'])
+            print(f"   {icon} [{done}/{len(exports)}] {user}: {detail}")
+            write_manifest(manifest, manifest_path)
+
+    manifest['users'].sort(key=lambda entry: entry['user'])
+    failed = [entry['user'] for entry in manifest['users'] if entry['status'] != 'ok']
+    manifest.update({
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'succeeded': len(exports) - len(failed),
+        'failed': failed
+    })
+    write_manifest(manifest, manifest_path)
+    return manifest
+
+
+def main():
+    """Función principal"""
+    import argparse
+    from stats_writer import COMPRESSION_FORMATS
+    from streaming_stats import TOP_K_MODES
+
+    parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Análisis por lotes")
+    parser.add_argument("input_dir", help="Directorio con un ZIP o una carpeta de export por usuario")
+    parser.add_argument("--output", default="batch_output", help="Directorio de salida (uno por usuario)")
+    parser.add_argument("--jobs", type=int, help="Usuarios analizados a la vez (por defecto, uno por CPU)")
+    parser.add_argument("--no-nlp", action="store_true",
+                        help="Modo rápido: sin análisis de sentimientos ni NLTK")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reutilizar el análisis previo de cada usuario (caché en su directorio)")
+    parser.add_argument("--search-index", action="store_true", default=None,
+                        help="Generar el índice de búsqueda de cada usuario")
+    parser.add_argument("--compress", choices=('none',) + tuple(COMPRESSION_FORMATS),
+                        help="Comprimir las estadísticas (por defecto FILE_CONFIG['compress_output'])")
+    parser.add_argument("--top-k", choices=TOP_K_MODES, help="Rankings exactos o aproximados")
+
+    args = parser.parse_args()
+
+    print("🚀 ChatGPT Analytics Pro - Análisis por lotes")
+    print("=" * 50)
+
+    options = {'nlp': not args.no_nlp, 'incremental': args.incremental,
+               'search_index': args.search_index, 'compress': args.compress, 'top_k': args.top_k}
+    manifest = run_batch(args.input_dir, args.output, args.jobs, options)
+
+    print(f"\n📋 {manifest['succeeded']} usuarios analizados, {len(manifest['failed'])} con errores "
+          f"en {manifest['wall_seconds']:.1f}s")
+    print(f"💾 Manifiesto guardado en: {Path(args.output) / MANIFEST_NAME}")
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Benchmarks del pipeline
+Genera exports sintéticos (synthetic_export.py) y mide cada etapa de
+parser.py y de ChatGPTParser: carga, análisis por mensaje, estadísticas
+finales y guardado. Cada medición corre en un proceso aparte para que el
+pico de memoria (RSS) corresponda solo a ese pipeline.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from synthetic_export import DEFAULT_SEED, write_export
+
+PIPELINES = ('parser', 'chatgpt_parser')
+DEFAULT_SIZES = (10_000,)
+STAGES = ('load', 'analysis', 'final_stats', 'save')
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo informa en KB y macOS en bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageTimer:
+    """Acumula el tiempo de pared de cada etapa
+
+    Se pasa como profiler a los pipelines, que marcan sus propias etapas;
+    los analizadores no se miden uno a uno para no sumarles overhead.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(self.stages.get(name, 0) + time.perf_counter() - start, 4)
+
+    def timed(self, name, callback):
+        return callback
+
+
+def run_chatgpt_parser(data_dir, nlp, timer):
+    """ChatGPTParser.process_conversations (modo serie); devuelve los mensajes analizados"""
+    from chatgpt_parser import ChatGPTParser
+
+    parser = ChatGPTParser(data_dir, nlp=nlp, search_index=False, max_conversations=0, profiler=timer)
+    parser.process_conversations()
+
+    with timer.stage('save'):
+        parser.save_stats('bench_chatgpt_stats.json')
+    return parser.stats['total_messages']
+
+
+def run_parser(data_dir, nlp, timer):
+    """parser.parse_conversations con sus opciones por defecto"""
+    from item_store import save_items
+    from parser import parse_conversations
+    from stats_writer import write_stats
+
+    stats = parse_conversations(str(Path(data_dir) / 'conversations.json'), nlp=nlp, max_conversations=0,
+                                profiler=timer)
+
+    with timer.stage('save'):
+        output_path = Path(data_dir) / 'bench_parser_stats.json'
+        write_stats(save_items(stats, output_path), output_path)
+    return stats['total_messages']
+
+
+RUNNERS = {'parser': run_parser, 'chatgpt_parser': run_chatgpt_parser}
+
+
+def run_worker(pipeline, data_dir, nlp, result_path):
+    """Ejecuta un pipeline en este proceso y guarda sus mediciones"""
+    timer = StageTimer()
+    messages = RUNNERS[pipeline](data_dir, nlp, timer)
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({'stages': timer.stages, 'messages': messages, 'peak_rss_mb': peak_rss_mb()}, f)
+
+
+def measure(pipeline, data_dir, nlp):
+    """Mide un pipeline en un proceso hijo"""
+    result_path = Path(data_dir) / f'bench_{pipeline}_result.json'
+    command = [sys.executable, str(Path(__file__).resolve()), '--worker', pipeline,
+               '--data-dir', str(data_dir), '--result', str(result_path)]
+    if not nlp:
+        command.append('--no-nlp')
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+    with open(result_path, 'r', encoding='utf-8') as f:
+        result = json.load(f)
+    result_path.unlink()
+
+    total_time = sum(result['stages'].values())
+    analysis_time = result['stages'].get('analysis') or 0
+    result.update({
+        'pipeline': pipeline,
+        'total_seconds': round(total_time, 4),
+        'msgs_per_sec': round(result['messages'] / total_time, 1) if total_time else None,
+        'analysis_msgs_per_sec': round(result['messages'] / analysis_time, 1) if analysis_time else None
+    })
+    return result
+
+
+def prepare_export(workdir, size, seed):
+    """Directorio con el export sintético de ese tamaño (se reutiliza si existe)"""
+    data_dir = Path(workdir) / f'synthetic_{size}_{seed}'
+    export_path = data_dir / 'conversations.json'
+    if not export_path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        print(f"🧪 Generando {size} conversaciones (semilla {seed})...")
+        start = time.perf_counter()
+        tmp_path = export_path.with_name(export_path.name + '.tmp')
+        write_export(tmp_path, size, seed)
+        tmp_path.replace(export_path)
+        print(f"   listo en {time.perf_counter() - start:.1f}s")
+    return data_dir
+
+
+def print_result(size, result):
+    stages = '  '.join(f"{name} {result['stages'].get(name, 0):7.2f}s" for name in STAGES)
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else '?'
+    print(f"   {result['pipeline']:<15} {size:>9}  {stages}  "
+          f"{result['msgs_per_sec'] or 0:>10.0f} msgs/s  pico RSS {rss}")
+
+
+def main():
+    """Función principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Conversaciones de cada export sintético (p. ej. 10000 100000 1000000)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla del generador")
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES),
+                        help="Pipelines a medir")
+    parser.add_argument("--workdir", default="benchmarks", help="Directorio de los exports generados")
+    parser.add_argument("--output", default="benchmark_results.json", help="Reporte JSON")
+    parser.add_argument("--no-nlp", action="store_true", help="Medir el modo rápido sin sentimientos ni NLTK")
+    # Uso interno: ejecución de un pipeline en el proceso hijo
+    parser.add_argument("--worker", choices=PIPELINES, help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.data_dir, not args.no_nlp, args.result)
+        return 0
+
+    print("⏱️  ChatGPT Analytics Pro - Benchmarks")
+    print("=" * 50)
+
+    results = []
+    for size in args.sizes:
+        data_dir = prepare_export(args.workdir, size, args.seed)
+        export_bytes = (data_dir / 'conversations.json').stat().st_size
+        for pipeline in args.pipelines:
+            result = measure(pipeline, data_dir, not args.no_nlp)
+            result.update({'conversations': size, 'export_bytes': export_bytes})
+            results.append(result)
+            print_result(size, result)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'nlp': not args.no_nlp,
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"💾 Reporte guardado en: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
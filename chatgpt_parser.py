@@ -6,142 +6,68 @@ Compatible con cualquier usuario y estructura de datos
 """
 
 import json
-import re
-import os
-from datetime import datetime, timedelta
-from collections import Counter, defaultdict
-import calendar
-import math
-import statistics
+from collections import Counter, defaultdict, deque
+from contextlib import nullcontext
+from itertools import chain, islice
 from pathlib import Path
-import warnings
-warnings.filterwarnings('ignore')
 
-# Importaciones opcionales para análisis avanzado
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
-    print("⚠️  TextBlob no disponible. El análisis de sentimientos estará limitado.")
-
-try:
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-    
-    # Descargar recursos de NLTK si no están disponibles
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords', quiet=True)
-    
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
-    print("⚠️  NLTK no disponible. El análisis de texto estará limitado.")
+from conversation_stream import iter_conversations
+from daily_activity import DailyActivity, activity_level
+from analysis_cache import ConversationCache
+from text_normalizer import tokenize
+from sentiment import SENTIMENT_BACKENDS
+from export_archive import find_export_zip, iter_zip_conversations, load_zip_conversations
+from message_table import MessageTable
+from analysis_engine import AnalysisEngine, extract_text
+from analyzers import ANALYZERS, SentimentAnalyzer
+from stats_writer import COMPRESSION_FORMATS, configured_compression, write_stats
+from conversation_index import INDEX_NAME, ConversationIndexBuilder
+from item_store import items_path_for, save_items
+from search_index import SEARCH_NAME, SearchIndexBuilder, configured_search_index, fts5_available
+from profiling import PROFILE_MODES, Profiler, profile_path_for
+from streaming_stats import STREAMING_TYPES, TOP_K_MODES
+from settings import config_value
 
 class ChatGPTParser:
     """Parser generalizado para datos de ChatGPT"""
     
-    def __init__(self, data_dir="."):
+    def __init__(self, data_dir=".", stream=False, zip_path=None, jobs=1, cache_path=None,
+                 nlp_cache_path=None, sentiment_backend=None, nlp=True, analyzers=None, roles=None,
+                 write_index=True, search_index=None, profiler=None, top_k=None, top_k_capacity=None,
+                 chunk_size=None, max_conversations=None, output_dir=None):
         self.data_dir = Path(data_dir)
+        # Directorio de los archivos generados (por defecto data_dir)
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.stream = stream
+        self.jobs = max(1, jobs or 1)
+        # Conversaciones por chunk y tope de conversaciones (None usa config.py; 0 = todas)
+        self.chunk_size = max(1, chunk_size or config_value('ANALYSIS_CONFIG', 'chunk_size', DEFAULT_CHUNK_SIZE))
+        if max_conversations is None:
+            max_conversations = config_value('ANALYSIS_CONFIG', 'max_conversations')
+        self.max_conversations = max_conversations or None
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.nlp_cache_path = Path(nlp_cache_path) if nlp_cache_path else None
+        self.nlp = nlp
+        self.zip_path = Path(zip_path) if zip_path else None
+        # Índice de offsets por conversación (conversations.index.json)
+        self.write_index = write_index
+        self.index_builder = None
+        # Índice de búsqueda FTS5 (chatgpt_search.sqlite); None usa config.py
+        self.search_index = configured_search_index() if search_index is None else search_index
+        # Motor de un solo recorrido compartido con parser.py
+        self.engine = AnalysisEngine(analyzers=analyzers, roles=roles, nlp=nlp,
+                                     sentiment_backend=sentiment_backend, nlp_cache_path=self.nlp_cache_path,
+                                     top_k=top_k, top_k_capacity=top_k_capacity)
+        self.sentiment_backend = self.engine.sentiment_backend
+        # Perfilado por etapa (--profile); los procesos hijos no se miden
+        self.profiler = profiler
+        if profiler:
+            self.engine.instrument(profiler)
         self.stats = self._initialize_stats()
         
     def _initialize_stats(self):
         """Inicializa la estructura de estadísticas"""
-        return {
-            # Estadísticas básicas
-            'total_conversations': 0,
-            'total_messages': 0,
-            'total_words': 0,
-            'total_characters': 0,
-            
-            # Actividad temporal
-            'daily_activity': defaultdict(int),
-            'hourly_activity': defaultdict(int),
-            'monthly_activity': defaultdict(int),
-            'weekly_activity': defaultdict(int),
-            'yearly_activity': defaultdict(int),
-            
-            # Análisis de contenido
-            'word_frequency': Counter(),
-            'conversation_lengths': [],
-            'topics': Counter(),
-            'languages': Counter(),
-            'message_types': Counter(),
-            'conversation_titles': [],
-            
-            # Análisis de sentimientos
-            'sentiment_scores': [],
-            'positive_messages': 0,
-            'negative_messages': 0,
-            'neutral_messages': 0,
-            
-            # Patrones de uso
-            'avg_message_length': 0,
-            'avg_words_per_message': 0,
-            'longest_message': 0,
-            'shortest_message': float('inf'),
-            'conversation_gaps': [],
-            
-            # Estadísticas temporales
-            'first_conversation': None,
-            'last_conversation': None,
-            'avg_conversation_length': 0,
-            'longest_conversation': 0,
-            'shortest_conversation': float('inf'),
-            'most_active_day': None,
-            'most_active_hour': None,
-            'most_active_month': None,
-            
-            # Análisis avanzado
-            'question_patterns': Counter(),
-            'code_blocks': 0,
-            'urls_shared': 0,
-            'emojis_used': Counter(),
-            'technical_terms': Counter(),
-            'programming_languages': Counter(),
-            
-            # Métricas de productividad
-            'conversations_per_day': 0,
-            'messages_per_day': 0,
-            'words_per_day': 0,
-            'peak_usage_periods': [],
-            'usage_trends': [],
-            
-            # Análisis de comportamiento
-            'session_lengths': [],
-            'break_patterns': [],
-            'engagement_levels': [],
-            'topic_evolution': defaultdict(list),
-            
-            # Estadísticas de archivos
-            'files_shared': 0,
-            'image_files': 0,
-            'document_files': 0,
-            'code_files': 0,
-            
-            # Análisis de calidad
-            'message_quality_scores': [],
-            'conversation_complexity': [],
-            'interaction_patterns': defaultdict(int),
-            
-            # Datos para visualizaciones
-            'heatmap_data': defaultdict(lambda: defaultdict(int)),
-            'network_data': defaultdict(list),
-            'timeline_data': [],
-            'correlation_data': defaultdict(float),
-            
-            # Análisis de días activos/inactivos
-            'days_analysis': {},
-            'cumulative_data': []
-        }
+        return self.engine.initial_stats()
     
     def find_conversations_file(self):
         """Busca el archivo conversations.json en el directorio"""
@@ -155,336 +81,318 @@ class ChatGPTParser:
         
         return None
     
-    def load_conversations(self):
-        """Carga las conversaciones desde el archivo JSON"""
+    def find_conversations_source(self):
+        """Devuelve (ruta, es_zip) con el origen de las conversaciones
+        
+        Se prefiere un conversations.json ya extraído; si no existe se usa
+        el ZIP del export directamente, sin extraerlo.
+        """
+        if self.zip_path:
+            return self.zip_path, True
+        
         conversations_file = self.find_conversations_file()
-        if not conversations_file:
-            raise FileNotFoundError("No se encontró conversations.json")
+        if conversations_file:
+            return conversations_file, False
+        
+        zip_path = find_export_zip(self.data_dir)
+        if zip_path:
+            return zip_path, True
         
-        print(f"📂 Cargando conversaciones desde: {conversations_file}")
+        raise FileNotFoundError("No se encontró conversations.json")
+    
+    def load_conversations(self):
+        """Carga las conversaciones desde el archivo JSON (hasta max_conversations)"""
+        source, is_zip = self.find_conversations_source()
         
-        with open(conversations_file, 'r', encoding='utf-8') as f:
-            conversations = json.load(f)
+        print(f"📂 Cargando conversaciones desde: {source}")
+        
+        if self.write_index or self.max_conversations:
+            # La lectura en streaming alimenta el índice y se detiene en el tope
+            conversations = list(islice(self._read_source(source, is_zip), self.max_conversations))
+        elif is_zip:
+            conversations = load_zip_conversations(source)
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                conversations = json.load(f)
         
         print(f"✅ {len(conversations)} conversaciones cargadas")
         return conversations
     
+    def iter_conversations(self):
+        """Itera las conversaciones una a una sin cargar el JSON completo"""
+        source, is_zip = self.find_conversations_source()
+        
+        print(f"📂 Leyendo conversaciones en streaming desde: {source}")
+        
+        yield from islice(self._read_source(source, is_zip), self.max_conversations)
+    
+    def _read_source(self, source, is_zip):
+        """Conversaciones de source; con write_index alimenta el índice de offsets"""
+        if self.write_index:
+            self.index_builder = ConversationIndexBuilder(source, is_zip)
+            if is_zip:
+                items = iter_zip_conversations(source, with_offsets=True)
+            else:
+                items = iter_conversations(source, with_offsets=True)
+            yield from self.index_builder.wrap(items)
+        elif is_zip:
+            yield from iter_zip_conversations(source)
+        else:
+            yield from iter_conversations(source)
+    
+    def iter_chunks(self, conversations):
+        """Agrupa las conversaciones en listas de chunk_size
+        
+        Si conversations es la lista cargada, cada chunk se quita de ella al
+        entregarse: las conversaciones ya agregadas se liberan chunk a chunk
+        en lugar de vivir hasta el final del análisis.
+        """
+        if not isinstance(conversations, list):
+            yield from _batched(conversations, self.chunk_size)
+            return
+        
+        # Invertida, cada chunk sale del final de la lista sin mover el resto
+        conversations.reverse()
+        while conversations:
+            chunk = conversations[-self.chunk_size:]
+            del conversations[-self.chunk_size:]
+            chunk.reverse()
+            yield chunk
+    
     def extract_text_content(self, content):
         """Extrae texto del contenido de un mensaje"""
-        if isinstance(content, str):
-            return content
-        elif isinstance(content, dict):
-            if 'parts' in content and content['parts']:
-                return content['parts'][0] if isinstance(content['parts'][0], str) else str(content['parts'][0])
-            elif 'text' in content:
-                return content['text']
-        return str(content)
+        return extract_text(content)
+    
+    @property
+    def nlp_cache(self):
+        """Caché de resultados NLP (None si no está activada)"""
+        return self.engine.nlp_cache
+    
+    @property
+    def stop_words(self):
+        """Stopwords de NLTK (o las básicas si NLP está desactivado)"""
+        return self.engine.stop_words
+    
+    def _worker_options(self):
+        """Opciones con las que se crean los parsers de los procesos hijos"""
+        return self.engine.options()
     
     def analyze_sentiment(self, text):
-        """Analiza el sentimiento del texto"""
-        if not TEXTBLOB_AVAILABLE or not text.strip():
-            return 0.0
-        
-        try:
-            blob = TextBlob(text)
-            return blob.sentiment.polarity
-        except:
-            return 0.0
-    
-    def analyze_content_advanced(self, text, stats):
-        """Análisis avanzado del contenido del texto"""
-        text_lower = text.lower()
-        
-        # Términos técnicos
-        tech_terms = [
-            'algorithm', 'database', 'api', 'framework', 'library', 'function',
-            'variable', 'class', 'object', 'method', 'array', 'string',
-            'integer', 'boolean', 'loop', 'condition', 'recursion', 'debugging',
-            'testing', 'deployment', 'server', 'client', 'frontend', 'backend',
-            'fullstack', 'devops', 'docker', 'kubernetes', 'aws', 'azure',
-            'machine learning', 'artificial intelligence', 'neural network',
-            'deep learning', 'data science', 'analytics', 'visualization'
-        ]
-        
-        for term in tech_terms:
-            if term in text_lower:
-                stats['technical_terms'][term] += 1
-        
-        # Lenguajes de programación
-        prog_langs = [
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby',
-            'go', 'rust', 'swift', 'kotlin', 'typescript', 'html', 'css',
-            'sql', 'r', 'matlab', 'scala', 'perl', 'bash', 'powershell'
-        ]
-        
-        for lang in prog_langs:
-            if lang in text_lower:
-                stats['programming_languages'][lang] += 1
-        
-        # Patrones de interacción
-        if 'gracias' in text_lower or 'thank you' in text_lower:
-            stats['interaction_patterns']['gratitud'] += 1
-        if 'por favor' in text_lower or 'please' in text_lower:
-            stats['interaction_patterns']['cortesía'] += 1
-        if 'explica' in text_lower or 'explain' in text_lower:
-            stats['interaction_patterns']['explicación'] += 1
-        if 'ayuda' in text_lower or 'help' in text_lower:
-            stats['interaction_patterns']['ayuda'] += 1
+        """Analiza el sentimiento del texto con TextBlob"""
+        return SentimentAnalyzer(self.engine).textblob_polarity(text)
+    
+    def score_sentiments(self, messages):
+        """Puntúa un lote de mensajes (MessageText) con el motor configurado"""
+        return SentimentAnalyzer(self.engine).score(messages, self.stats)
+    
+    def tokenize(self, text):
+        """Tokeniza el texto en minúsculas con el tokenizador compartido"""
+        return tokenize(text.lower())
     
     def get_activity_level(self, count):
         """Determina el nivel de actividad basado en el conteo"""
-        if count == 0:
-            return 0
-        elif count <= 2:
-            return 1
-        elif count <= 5:
-            return 2
-        elif count <= 10:
-            return 3
-        else:
-            return 4
+        return activity_level(count)
     
     def generate_github_style_data(self, daily_activity):
         """Genera datos para el gráfico estilo GitHub con años completos"""
-        if not daily_activity:
-            return []
-        
-        # Encontrar rango de fechas
-        dates = [datetime.strptime(date, '%Y-%m-%d') for date in daily_activity.keys()]
-        start_date = min(dates)
-        end_date = max(dates)
-        
-        # Expandir a años completos
-        start_year = start_date.year
-        end_year = end_date.year
-        
-        github_data = []
-        
-        for year in range(start_year, end_year + 1):
-            # Para cada año, generar todos los días del año
-            year_start = datetime(year, 1, 1)
-            year_end = datetime(year, 12, 31)
-            
-            current_date = year_start
-            while current_date <= year_end:
-                date_str = current_date.strftime('%Y-%m-%d')
-                count = daily_activity.get(date_str, 0)
-                
-                # Marcar el 30 de noviembre de 2022 (día que salió ChatGPT)
-                special_level = None
-                if date_str == '2022-11-30':
-                    special_level = 'launch'  # Nivel especial para el lanzamiento
-                
-                github_data.append({
-                    'date': date_str,
-                    'count': count,
-                    'level': self.get_activity_level(count),
-                    'special_level': special_level
-                })
-                
-                current_date += timedelta(days=1)
-        
-        return github_data
+        return DailyActivity(daily_activity).github_calendar()
     
     def analyze_active_days(self, daily_activity, first_date, last_date):
         """Analiza días activos vs inactivos"""
         if not first_date or not last_date:
             return {}
         
-        total_days = (last_date - first_date).days + 1
-        active_days = len(daily_activity)
-        inactive_days = total_days - active_days
-        
-        active_percentage = (active_days / total_days) * 100 if total_days > 0 else 0
-        inactive_percentage = (inactive_days / total_days) * 100 if total_days > 0 else 0
-        
-        return {
-            'total_days': total_days,
-            'active_days': active_days,
-            'inactive_days': inactive_days,
-            'active_percentage': round(active_percentage, 2),
-            'inactive_percentage': round(inactive_percentage, 2)
-        }
+        return DailyActivity(daily_activity, first_date, last_date).active_days_summary()
     
     def generate_cumulative_data(self, daily_activity):
         """Genera datos acumulados para gráfico de evolución"""
-        if not daily_activity:
-            return []
-        
-        sorted_dates = sorted(daily_activity.keys())
-        
-        cumulative_data = []
-        cumulative_conversations = 0
-        
-        for date_str in sorted_dates:
-            daily_count = daily_activity[date_str]
-            cumulative_conversations += daily_count
-            
-            cumulative_data.append({
-                'date': date_str,
-                'daily_conversations': daily_count,
-                'cumulative_conversations': cumulative_conversations,
-            })
-        
-        return cumulative_data
+        return DailyActivity(daily_activity).cumulative()
+    
+    def _output_path(self, name):
+        """Ruta de un archivo generado (en output_dir o data_dir)"""
+        return (self.output_dir or self.data_dir) / name
+    
+    def _stage(self, name):
+        """Contexto que mide la etapa si hay un profiler"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
     
     def process_conversations(self):
-        """Procesa todas las conversaciones y genera estadísticas"""
-        conversations = self.load_conversations()
+        """Procesa todas las conversaciones y genera estadísticas
         
-        all_dates = []
-        all_message_lengths = []
-        all_sentiment_scores = []
+        En modo streaming la lectura ocurre dentro de la etapa 'analysis'.
+        """
+        if self.stream:
+            conversations = self.iter_conversations()
+            total = None
+        else:
+            with self._stage('load'):
+                conversations = self.load_conversations()
+            total = len(conversations)
+        
+        table = MessageTable()
+        chunks = self.iter_chunks(conversations)
+        
+        search_builder = None
+        if self.search_index:
+            if fts5_available():
+                search_builder = SearchIndexBuilder(self._output_path(SEARCH_NAME))
+                chunks = _indexed_chunks(chunks, search_builder)
+            else:
+                print("⚠️  El SQLite de Python no incluye FTS5: no se generará el índice de búsqueda")
         
-        print("⚙️  Procesando conversaciones...")
+        print(f"⚙️  Procesando conversaciones en chunks de {self.chunk_size}...")
         
-        for i, conversation in enumerate(conversations):
-            if i % 1000 == 0 and i > 0:
-                print(f"   Procesadas {i}/{len(conversations)} conversaciones...")
-            
-            # Información básica de la conversación
-            conv_id = conversation.get('id', f'conv_{i}')
-            create_time = conversation.get('create_time', 0)
-            title = conversation.get('title', 'Sin título')
-            
-            if create_time:
-                conv_date = datetime.fromtimestamp(create_time)
-                date_str = conv_date.strftime('%Y-%m-%d')
-                hour = conv_date.hour
-                month = conv_date.strftime('%Y-%m')
-                weekday = conv_date.strftime('%A')
-                year = conv_date.year
-                
-                all_dates.append(conv_date)
-                
-                # Actividad temporal
-                self.stats['daily_activity'][date_str] += 1
-                self.stats['hourly_activity'][hour] += 1
-                self.stats['monthly_activity'][month] += 1
-                self.stats['weekly_activity'][weekday] += 1
-                self.stats['yearly_activity'][year] += 1
-                
-                # Heatmap data
-                self.stats['heatmap_data'][weekday][hour] += 1
-            
-            # Procesar mensajes
-            mapping = conversation.get('mapping', {})
-            message_count = 0
+        try:
+            with self._stage('analysis'):
+                if self.cache_path:
+                    self._process_incremental(chunks, total, table)
+                elif self.jobs > 1:
+                    self._process_parallel(chunks, total, table)
+                else:
+                    processed = 0
+                    for chunk in chunks:
+                        for conversation in chunk:
+                            self.process_conversation(conversation, processed, table)
+                            processed += 1
+                        print(f"   Procesadas {processed}/{total or '?'} conversaciones...")
             
-            for msg_id, msg_data in mapping.items():
-                if msg_data.get('message'):
-                    message = msg_data['message']
-                    content = message.get('content', {})
-                    role = message.get('author', {}).get('role', 'unknown')
-                    
-                    # Extraer texto
-                    text = self.extract_text_content(content)
-                    if text:
-                        message_count += 1
-                        self.stats['total_messages'] += 1
-                        
-                        # Análisis de texto
-                        words = text.split()
-                        self.stats['total_words'] += len(words)
-                        self.stats['total_characters'] += len(text)
-                        
-                        all_message_lengths.append(len(text))
-                        
-                        # Frecuencia de palabras
-                        if NLTK_AVAILABLE:
-                            try:
-                                tokens = word_tokenize(text.lower())
-                                stop_words = set(stopwords.words('spanish') + stopwords.words('english'))
-                                filtered_tokens = [token for token in tokens if token.isalpha() and token not in stop_words]
-                                self.stats['word_frequency'].update(filtered_tokens)
-                            except:
-                                # Fallback simple
-                                words_lower = [word.lower() for word in words if word.isalpha()]
-                                self.stats['word_frequency'].update(words_lower)
-                        
-                        # Análisis de sentimientos
-                        sentiment = self.analyze_sentiment(text)
-                        all_sentiment_scores.append(sentiment)
-                        
-                        if sentiment > 0.1:
-                            self.stats['positive_messages'] += 1
-                        elif sentiment < -0.1:
-                            self.stats['negative_messages'] += 1
-                        else:
-                            self.stats['neutral_messages'] += 1
-                        
-                        # Análisis avanzado
-                        self.analyze_content_advanced(text, self.stats)
-                        
-                        # Patrones de pregunta
-                        if text.strip().endswith('?'):
-                            self.stats['question_patterns']['preguntas'] += 1
-                        
-                        # Código y URLs
-                        if '```' in text:
-                            self.stats['code_blocks'] += 1
-                        if 'http' in text.lower():
-                            self.stats['urls_shared'] += 1
+            if self.nlp_cache:
+                with self._stage('nlp_cache_flush'):
+                    self.nlp_cache.flush()
             
-            # Estadísticas de conversación
-            self.stats['conversation_lengths'].append(message_count)
-            self.stats['conversation_titles'].append(title)
+            # Calcular estadísticas finales
+            with self._stage('final_stats'):
+                self._calculate_final_stats(table)
             
-            if message_count > self.stats['longest_conversation']:
-                self.stats['longest_conversation'] = message_count
-            if message_count < self.stats['shortest_conversation']:
-                self.stats['shortest_conversation'] = message_count
-        
-        # Calcular estadísticas finales
-        self._calculate_final_stats(all_dates, all_message_lengths, all_sentiment_scores)
+            if search_builder:
+                with self._stage('search_index'):
+                    search_path = search_builder.close()
+                print(f"🔎 Índice de búsqueda ({search_builder.messages} mensajes) guardado en: {search_path}")
+        except BaseException:
+            # No dejar un índice de búsqueda a medias (chatgpt_search.sqlite.tmp)
+            if search_builder:
+                search_builder.abort()
+            raise
+        
+        if self.index_builder:
+            with self._stage('conversation_index'):
+                # Sin output_dir el índice queda junto a conversations.json
+                index_path = self.index_builder.write(self._output_path(INDEX_NAME) if self.output_dir else None)
+            print(f"🗂️  Índice de conversaciones guardado en: {index_path}")
         
         print("✅ Procesamiento completado")
         return self.stats
     
-    def _calculate_final_stats(self, all_dates, all_message_lengths, all_sentiment_scores):
-        """Calcula estadísticas finales"""
-        # Estadísticas básicas
-        self.stats['total_conversations'] = len(self.stats['conversation_lengths'])
-        
-        if all_message_lengths:
-            self.stats['avg_message_length'] = statistics.mean(all_message_lengths)
-            self.stats['longest_message'] = max(all_message_lengths)
-            self.stats['shortest_message'] = min(all_message_lengths)
-            self.stats['avg_words_per_message'] = self.stats['total_words'] / len(all_message_lengths)
-        
-        if all_dates:
-            self.stats['first_conversation'] = min(all_dates).strftime('%Y-%m-%d')
-            self.stats['last_conversation'] = max(all_dates).strftime('%Y-%m-%d')
-            
-            # Análisis de días activos/inactivos
-            self.stats['days_analysis'] = self.analyze_active_days(
-                self.stats['daily_activity'], min(all_dates), max(all_dates)
-            )
-            
-            # Datos acumulados
-            self.stats['cumulative_data'] = self.generate_cumulative_data(self.stats['daily_activity'])
+    def process_conversation(self, conversation, i, table):
+        """Procesa una conversación y acumula sus estadísticas en self.stats
+        
+        Fechas, longitudes y sentimientos se guardan en la tabla columnar.
+        """
+        self.engine.process_conversation(conversation, i, self.stats, table)
+    
+    def _process_parallel(self, chunks, total, table):
+        """Reparte las conversaciones de cada chunk en lotes entre varios procesos
+        
+        Cada proceso devuelve estadísticas parciales que se fusionan en el
+        mismo orden de los lotes, por lo que el resultado es idéntico al de
+        la ejecución en serie.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print(f"🧵 Usando {self.jobs} procesos")
+        
+        processed = 0
+        pending = deque()
+        
+        def collect():
+            nonlocal processed
+            partial, rows, count = pending.popleft().result()
+            merge_stats(self.stats, partial)
+            table.extend(rows)
+            processed += count
+            print(f"   Procesadas {processed}/{total or '?'} conversaciones...")
+        
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            start = 0
+            for batch in _batched(chain.from_iterable(chunks), PARALLEL_BATCH_SIZE):
+                # Limitar los lotes en vuelo para mantener la memoria acotada
+                if len(pending) >= self.jobs * 2:
+                    collect()
+                pending.append(executor.submit(_process_batch, batch, start, self._worker_options()))
+                start += len(batch)
             
-            # Métricas de productividad
-            date_range = (max(all_dates) - min(all_dates)).days
-            if date_range > 0:
-                self.stats['conversations_per_day'] = self.stats['total_conversations'] / date_range
-                self.stats['messages_per_day'] = self.stats['total_messages'] / date_range
-                self.stats['words_per_day'] = self.stats['total_words'] / date_range
-        
-        if self.stats['conversation_lengths']:
-            self.stats['avg_conversation_length'] = statistics.mean(self.stats['conversation_lengths'])
-        
-        # Encontrar períodos más activos
-        if self.stats['daily_activity']:
-            self.stats['most_active_day'] = max(self.stats['daily_activity'], key=self.stats['daily_activity'].get)
-        if self.stats['hourly_activity']:
-            self.stats['most_active_hour'] = max(self.stats['hourly_activity'], key=self.stats['hourly_activity'].get)
-        if self.stats['monthly_activity']:
-            self.stats['most_active_month'] = max(self.stats['monthly_activity'], key=self.stats['monthly_activity'].get)
-    
-    def save_stats(self, output_file="chatgpt_stats.json"):
-        """Guarda las estadísticas en un archivo JSON"""
-        output_path = self.data_dir / output_file
+            while pending:
+                collect()
+    
+    def _process_incremental(self, chunks, total, table):
+        """Reutiliza el análisis guardado de las conversaciones sin cambios
+        
+        Solo se analizan las conversaciones nuevas o con otro update_time; el
+        resto se re-agrega desde la caché. Los resultados se fusionan en el
+        orden del export para que coincidan con una ejecución completa.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        executor = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        window = self.jobs * PARALLEL_BATCH_SIZE
+        pending = deque()
+        
+        def collect(cache):
+            conv_id, update_time, result = pending.popleft()
+            if not isinstance(result, tuple):
+                result = result.result()
+                cache.put(conv_id, update_time, result)
+            partial, rows = result
+            merge_stats(self.stats, partial)
+            table.extend(rows)
+        
+        try:
+            with ConversationCache(self.cache_path, self._cache_signature()) as cache:
+                for i, conversation in enumerate(chain.from_iterable(chunks)):
+                    if i % self.chunk_size == 0 and i > 0:
+                        print(f"   Procesadas {i}/{total or '?'} conversaciones...")
+                    
+                    conv_id = conversation.get('id', f'conv_{i}')
+                    update_time = conversation.get('update_time') or conversation.get('create_time') or 0
+                    
+                    result = cache.get(conv_id, update_time)
+                    if result is None:
+                        if executor:
+                            result = executor.submit(_process_single, conversation, i, self._worker_options())
+                        else:
+                            result = _process_single(conversation, i, self._worker_options())
+                            cache.put(conv_id, update_time, result)
+                    pending.append((conv_id, update_time, result))
+                    
+                    while len(pending) > window:
+                        collect(cache)
+                
+                while pending:
+                    collect(cache)
+                
+                removed = cache.prune()
+                print(f"♻️  Caché: {cache.hits} reutilizadas, {cache.misses} analizadas, {removed} eliminadas")
+        finally:
+            if executor:
+                executor.shutdown()
+    
+    def _cache_signature(self):
+        """Opciones que cambian el resultado por conversación (para la caché)"""
+        options = self.engine.options()
+        del options['nlp_cache_path']
+        return repr(sorted(options.items()))
+    
+    def _calculate_final_stats(self, table):
+        """Calcula estadísticas finales"""
+        self.engine.finalize(self.stats, table)
+    
+    def save_stats(self, output_file="chatgpt_stats.json", compression=None):
+        """Guarda las estadísticas en un archivo JSON compacto
+        
+        Con compression=None se usa FILE_CONFIG['compress_output']. Las listas
+        por conversación van a chatgpt_items.sqlite (API /api/items/).
+        """
+        output_path = self._output_path(output_file)
         
         # Convertir defaultdict y Counter a dict/list para JSON
         stats_json = {}
@@ -496,12 +404,134 @@ class ChatGPTParser:
             else:
                 stats_json[key] = value
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(stats_json, f, ensure_ascii=False, indent=2, default=str)
+        stats_json = save_items(stats_json, output_path)
+        
+        if compression is None:
+            compression = configured_compression()
+        output_path = write_stats(stats_json, output_path, compression)
         
         print(f"💾 Estadísticas guardadas en: {output_path}")
+        print(f"🗃️  Listas por conversación en: {items_path_for(output_path)}")
         return output_path
 
+# Conversaciones por lote en el modo multiproceso
+PARALLEL_BATCH_SIZE = 200
+
+# Conversaciones por chunk si config.py no indica chunk_size
+DEFAULT_CHUNK_SIZE = 1000
+
+# Campos que se fusionan con máximo/mínimo en lugar de sumarse
+_MAX_KEYS = {'longest_conversation', 'longest_message'}
+_MIN_KEYS = {'shortest_conversation', 'shortest_message'}
+
+def _batched(iterable, size):
+    """Agrupa un iterable en listas de tamaño fijo"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _indexed_chunks(chunks, search_builder):
+    """Agrega cada chunk al índice de búsqueda antes de analizarlo"""
+    for chunk in chunks:
+        for conversation in chunk:
+            search_builder.add_conversation(conversation)
+        yield chunk
+
+def _to_plain(value):
+    """Convierte defaultdicts anidados en dicts (los lambdas no se pueden serializar)"""
+    if isinstance(value, Counter):
+        return Counter(value)
+    if isinstance(value, dict):
+        return {k: _to_plain(v) for k, v in value.items()}
+    return value
+
+def _merge_counts(target, partial):
+    """Suma recursivamente diccionarios de conteos"""
+    for key, value in partial.items():
+        if isinstance(value, dict):
+            sub_target = target[key] if isinstance(target, defaultdict) else target.setdefault(key, {})
+            _merge_counts(sub_target, value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+def merge_stats(target, partial):
+    """Fusiona unas estadísticas parciales en target
+    
+    Los contadores y diccionarios se suman clave a clave, las listas se
+    concatenan en orden, los acumuladores en streaming se fusionan con merge
+    y los números se suman (o max/min según el campo).
+    """
+    for key, value in partial.items():
+        if key not in target or target[key] is None:
+            target[key] = value
+            continue
+        
+        current = target[key]
+        if isinstance(current, dict):
+            _merge_counts(current, value)
+        elif isinstance(current, list):
+            current.extend(value)
+        elif isinstance(current, STREAMING_TYPES):
+            current.merge(value)
+        elif value is None:
+            continue
+        elif key in _MAX_KEYS:
+            target[key] = max(current, value)
+        elif key in _MIN_KEYS:
+            target[key] = min(current, value)
+        elif isinstance(current, (int, float)) and not isinstance(current, bool):
+            target[key] = current + value
+
+# Parser de cada proceso hijo, reutilizado mientras no cambien las opciones
+_worker = None
+_worker_key = None
+_worker_defaults = None
+
+def _worker_parser(options):
+    """Parser del proceso actual con las estadísticas en cero
+    
+    Crear un ChatGPTParser (motor, analizadores, caché NLP) por lote o por
+    conversación costaba más que analizarla; se crea una vez por proceso.
+    """
+    global _worker, _worker_key, _worker_defaults
+    key = repr(sorted(options.items()))
+    if _worker is None or key != _worker_key:
+        _worker = ChatGPTParser(**options)
+        _worker_key = key
+        _worker_defaults = _to_plain(_worker._initialize_stats())
+    else:
+        _worker.stats = _worker._initialize_stats()
+    return _worker
+
+def _process_batch(batch, start, options):
+    """Procesa un lote de conversaciones en un proceso hijo"""
+    worker = _worker_parser(options)
+    table = MessageTable()
+    
+    for offset, conversation in enumerate(batch):
+        worker.process_conversation(conversation, start + offset, table)
+    
+    if worker.nlp_cache:
+        worker.nlp_cache.flush()
+    
+    return _to_plain(worker.stats), table, len(batch)
+
+def _process_single(conversation, i, options):
+    """Analiza una sola conversación y devuelve su aporte a las estadísticas"""
+    worker = _worker_parser(options)
+    table = MessageTable()
+    
+    worker.process_conversation(conversation, i, table)
+    
+    # Guardar solo los campos que la conversación modificó
+    partial = {key: value for key, value in _to_plain(worker.stats).items() if value != _worker_defaults[key]}
+    return partial, table
+
 def main():
     """Función principal para ejecutar el parser"""
     import argparse
@@ -509,6 +539,38 @@ def main():
     parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Parser")
     parser.add_argument("--data-dir", default=".", help="Directorio con los datos de ChatGPT")
     parser.add_argument("--output", default="chatgpt_stats.json", help="Archivo de salida")
+    parser.add_argument("--stream", action="store_true", help="Leer conversations.json en streaming (memoria acotada)")
+    parser.add_argument("--zip", dest="zip_path", help="ZIP del export a analizar sin extraerlo")
+    parser.add_argument("--jobs", type=int, default=1, help="Número de procesos para el análisis")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Conversaciones por chunk (por defecto ANALYSIS_CONFIG['chunk_size'])")
+    parser.add_argument("--max-conversations", type=int,
+                        help="Analizar solo las primeras N conversaciones (0 = todas; "
+                             "por defecto ANALYSIS_CONFIG['max_conversations'])")
+    parser.add_argument("--nlp-cache", nargs="?", const="chatgpt_nlp_cache.sqlite",
+                        help="Caché en disco de sentimiento y tokens por texto (SQLite)")
+    parser.add_argument("--sentiment", choices=SENTIMENT_BACKENDS,
+                        help="Motor de sentimientos (por defecto ANALYSIS_CONFIG['sentiment_backend'])")
+    parser.add_argument("--no-nlp", action="store_true",
+                        help="Modo rápido: sin análisis de sentimientos ni NLTK")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reutilizar el análisis de las conversaciones sin cambios desde la última ejecución")
+    parser.add_argument("--analyzers", nargs="+", choices=sorted(ANALYZERS),
+                        help="Analizadores a ejecutar (por defecto todos)")
+    parser.add_argument("--roles", nargs="+",
+                        help="Roles de autor a analizar, p. ej. user (por defecto todos)")
+    parser.add_argument("--compress", choices=('none',) + tuple(COMPRESSION_FORMATS),
+                        help="Comprimir la salida (por defecto FILE_CONFIG['compress_output'])")
+    parser.add_argument("--search-index", action="store_true", default=None,
+                        help="Generar chatgpt_search.sqlite para /api/search (por defecto ANALYSIS_CONFIG['build_search_index'])")
+    parser.add_argument("--profile", nargs="?", const="basic", choices=PROFILE_MODES,
+                        help="Guardar tiempos por etapa y analizador en <salida>.profile.json "
+                             "(cprofile/tracemalloc agregan funciones y memoria)")
+    parser.add_argument("--top-k", choices=TOP_K_MODES,
+                        help="Rankings de palabras/emojis/términos: exactos o aproximados en memoria fija "
+                             "(por defecto ANALYSIS_CONFIG['top_k_mode'])")
+    parser.add_argument("--no-index", action="store_true",
+                        help="No generar conversations.index.json (API /api/conversations del servidor)")
     
     args = parser.parse_args()
     
@@ -517,13 +579,40 @@ def main():
     
     try:
         # Crear parser
-        chatgpt_parser = ChatGPTParser(args.data_dir)
+        cache_path = None
+        if args.incremental:
+            # Junto al archivo de salida (la misma ruta que usa save_stats)
+            output_file = Path(args.data_dir) / args.output
+            cache_path = output_file.with_name(output_file.stem + '.cache.sqlite')
+        
+        profiler = Profiler(args.profile) if args.profile else None
+        if profiler:
+            profiler.start()
+        
+        chatgpt_parser = ChatGPTParser(args.data_dir, stream=args.stream, zip_path=args.zip_path,
+                                       jobs=args.jobs, cache_path=cache_path,
+                                       nlp_cache_path=args.nlp_cache, sentiment_backend=args.sentiment,
+                                       nlp=not args.no_nlp, analyzers=args.analyzers, roles=args.roles,
+                                       write_index=not args.no_index, search_index=args.search_index,
+                                       profiler=profiler, top_k=args.top_k, chunk_size=args.chunk_size,
+                                       max_conversations=args.max_conversations)
         
         # Procesar conversaciones
         stats = chatgpt_parser.process_conversations()
         
         # Guardar estadísticas
-        output_path = chatgpt_parser.save_stats(args.output)
+        with chatgpt_parser._stage('save'):
+            output_path = chatgpt_parser.save_stats(args.output, args.compress)
+        
+        if profiler:
+            profile_path = profiler.write(profile_path_for(output_path),
+                                          conversations=stats['total_conversations'],
+                                          messages=stats['total_messages'],
+                                          options={'stream': args.stream, 'jobs': args.jobs,
+                                                   'incremental': args.incremental, 'nlp': not args.no_nlp,
+                                                   'sentiment_backend': chatgpt_parser.sentiment_backend,
+                                                   'top_k': chatgpt_parser.engine.top_k})
+            print(f"⏱️  Perfil guardado en: {profile_path}")
         
         print("\n✅ Procesamiento completado exitosamente")
         print(f"📊 Estadísticas generadas: {stats['total_conversations']} conversaciones")
@@ -5,16 +5,23 @@
 SERVER_CONFIG = {
     'port': 8001,
     'auto_open_browser': True,
-    'host': 'localhost'
+    'host': 'localhost',
+    'max_workers': 16,  # Peticiones atendidas a la vez (las keep-alive inactivas no ocupan hilo)
+    'max_event_clients': 32,  # Clientes de /api/events en modo --watch (hilos aparte)
+    'shutdown_timeout': 10  # Segundos de espera a las peticiones en curso al detenerse
 }
 
 # Configuración de análisis
 ANALYSIS_CONFIG = {
-    'enable_sentiment_analysis': True,
-    'enable_advanced_analysis': True,
-    'enable_audio_analysis': True,
-    'max_conversations': None,  # None para procesar todas
-    'chunk_size': 1000  # Procesar en chunks para datasets grandes
+    'enable_sentiment_analysis': True,  # False omite los analizadores 'sentiment' y 'complexity'
+    'sentiment_backend': 'textblob',  # 'textblob' (preciso) o 'lexicon' (rápido, por lotes)
+    'enable_advanced_analysis': True,  # False omite 'code_urls', 'emoji' y 'complexity'
+    'enable_audio_analysis': True,  # Reservado: aún no hay análisis de audios
+    'build_search_index': False,  # Generar chatgpt_search.sqlite (búsqueda en /api/search)
+    'top_k_mode': 'exact',  # 'exact' o 'approximate' (rankings en memoria fija, Space-Saving)
+    'top_k_capacity': 10000,  # Claves que guarda cada ranking aproximado
+    'max_conversations': None,  # None para procesar todas (--max-conversations)
+    'chunk_size': 1000  # Conversaciones por chunk; cada chunk se libera al agregarlo (--chunk-size)
 }
 
 # Configuración de visualizaciones
@@ -31,7 +38,7 @@ FILE_CONFIG = {
     'data_dir': '.',
     'output_file': 'chatgpt_stats.json',
     'backup_stats': True,
-    'compress_output': False
+    'compress_output': False  # True o 'gzip', 'zstd' (requiere zstandard)
 }
 
 # Configuración de logging
@@ -40,3 +47,12 @@ LOGGING_CONFIG = {
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     'file': 'chatgpt_analytics.log'
 }
+
+# Listas de términos (None para usar las listas por defecto de text_matcher.py)
+# Cada categoría acepta una lista de términos o un dict etiqueta -> frases
+TERMS_CONFIG = {
+    'technical_terms': None,
+    'programming_languages': None,
+    'interaction_patterns': None,
+    'topics': None
+}
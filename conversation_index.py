@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Índice de offsets de conversations.json
+El parser guarda, para cada conversación, su id, título, create_time y el
+rango de bytes que ocupa en el export. Con ese índice el servidor lee una
+sola conversación (vía mmap) sin cargar ni enviar el archivo completo.
+"""
+
+import json
+import mmap
+import os
+import random
+import threading
+import zipfile
+from pathlib import Path
+
+from export_archive import CONVERSATIONS_NAME, find_member
+from stats_writer import write_stats
+
+INDEX_NAME = "conversations.index.json"
+INDEX_VERSION = 1
+
+# Columnas de cada entrada del índice
+ENTRY_FIELDS = ('id', 'title', 'create_time', 'start', 'end')
+
+
+def index_path_for(source):
+    """Ruta del índice para un conversations.json o ZIP (mismo directorio)"""
+    return Path(source).parent / INDEX_NAME
+
+
+class ConversationIndexBuilder:
+    """Acumula las entradas del índice mientras se leen las conversaciones"""
+
+    def __init__(self, source, is_zip=False):
+        self.source = Path(source)
+        self.is_zip = is_zip
+        self.entries = []
+
+    def wrap(self, items):
+        """Recibe (conversación, inicio, fin) y produce solo las conversaciones"""
+        for conversation, start, end in items:
+            self.entries.append([
+                conversation.get('id') or f"conv_{len(self.entries)}",
+                conversation.get('title') or 'Sin título',
+                conversation.get('create_time'),
+                start,
+                end
+            ])
+            yield conversation
+
+    def write(self, path=None):
+        """Guarda el índice (por defecto junto al export) y devuelve su ruta"""
+        path = Path(path) if path else index_path_for(self.source)
+        stat = self.source.stat()
+        index = {
+            'version': INDEX_VERSION,
+            # Ruta relativa al índice para poder mover el directorio completo
+            'source': os.path.relpath(self.source.resolve(), path.resolve().parent),
+            'zip_member': CONVERSATIONS_NAME if self.is_zip else None,
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'fields': list(ENTRY_FIELDS),
+            'conversations': self.entries
+        }
+        return write_stats(index, path)
+
+
+class ConversationIndex:
+    """Acceso aleatorio a las conversaciones de un export indexado"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {data.get('version')}")
+
+        self.source = (self.path.parent / data['source']).resolve()
+        self.zip_member = data.get('zip_member')
+        self.source_size = data['source_size']
+        self.source_mtime_ns = data['source_mtime_ns']
+        self.entries = data['conversations']
+        self.positions = {entry[0]: position for position, entry in enumerate(self.entries)}
+
+        self._file = None
+        self._mmap = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_stale(self):
+        """Indica si el export cambió desde que se generó el índice"""
+        try:
+            stat = self.source.stat()
+        except OSError:
+            return True
+        return stat.st_size != self.source_size or stat.st_mtime_ns != self.source_mtime_ns
+
+    def read(self, position):
+        """Bytes JSON de la conversación en esa posición"""
+        _, _, _, start, end = self.entries[position]
+        if self.zip_member:
+            # Los miembros comprimidos no admiten mmap: se descomprime hasta el offset
+            with zipfile.ZipFile(self.source) as zf:
+                with zf.open(find_member(zf, self.zip_member)) as f:
+                    f.seek(start)
+                    return f.read(end - start)
+
+        with self._lock:
+            if self._mmap is None:
+                self._file = open(self.source, 'rb')
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[start:end]
+
+    def random_position(self):
+        return random.randrange(len(self.entries)) if self.entries else None
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._file.close()
+                self._mmap = None
+                self._file = None
+
+
+_open_indexes = {}
+_open_lock = threading.Lock()
+
+
+def open_index(path):
+    """Índice compartido para path, recargado si el archivo del índice cambió
+
+    Devuelve None si no existe.
+    """
+    path = Path(path)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = str(path.resolve())
+    with _open_lock:
+        cached = _open_indexes.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        index = ConversationIndex(path)
+        if cached is not None:
+            cached[1].close()
+        _open_indexes[key] = (mtime_ns, index)
+        return index
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Lectura incremental de conversations.json
+Recorre el array principal del export conversación por conversación
+sin cargar el archivo completo en memoria
+"""
+
+import json
+import io
+
+# Tamaño de lectura inicial (caracteres)
+READ_SIZE = 1 << 20
+
+_WHITESPACE = ' \t\n\r'
+
+
+def _skip_whitespace(buffer, index):
+    """Avanza el índice mientras haya espacios en blanco"""
+    length = len(buffer)
+    while index < length and buffer[index] in _WHITESPACE:
+        index += 1
+    return index
+
+
+def _error(message, buffer, index):
+    """JSONDecodeError como el de json.load (posición relativa al buffer)"""
+    return json.JSONDecodeError(message, buffer, index)
+
+
+def _utf8_length(text):
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def iter_json_array(fp, read_size=READ_SIZE, with_offsets=False):
+    """Itera los elementos de un array JSON de nivel superior desde un archivo
+
+    Acepta archivos en modo texto o binario (UTF-8). La memoria usada queda
+    acotada por el elemento más grande del array, no por el tamaño total.
+    Con with_offsets=True produce (elemento, byte_inicio, byte_fin); para que
+    los offsets sean exactos un archivo de texto debe abrirse con newline=''.
+    """
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(fp, 'mode', ''):
+        fp = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    index = 0
+    # Offset en bytes de buffer[index] (solo con with_offsets)
+    position = 0
+    eof = False
+    chunk = read_size
+
+    def fill():
+        nonlocal buffer, index, eof
+        data = fp.read(chunk)
+        if not data:
+            eof = True
+            return False
+        # Descartar lo ya consumido para no acumular texto
+        buffer = buffer[index:] + data
+        index = 0
+        return True
+
+    # Buscar el inicio del array (ignorando un posible BOM)
+    while True:
+        start = index
+        index = _skip_whitespace(buffer, index)
+        position += index - start
+        if index < len(buffer) and buffer[index] == '\ufeff':
+            index += 1
+            position += 3
+            continue
+        if index < len(buffer):
+            break
+        if not fill():
+            raise _error("conversations.json está vacío", buffer, index)
+    if buffer[index] != '[':
+        raise ValueError("conversations.json no contiene un array JSON")
+    index += 1
+    position += 1
+
+    expecting_value = True
+    first = True
+    while True:
+        start = index
+        index = _skip_whitespace(buffer, index)
+        position += index - start
+        if index >= len(buffer):
+            if not fill():
+                raise _error("conversations.json terminó de forma inesperada", buffer, index)
+            continue
+
+        char = buffer[index]
+        if char == ']':
+            if expecting_value and not first:
+                raise _error("Coma final antes del cierre del array", buffer, index)
+            return
+        if char == ',':
+            if expecting_value:
+                raise _error("Coma inesperada", buffer, index)
+            expecting_value = True
+            index += 1
+            position += 1
+            continue
+        if not expecting_value:
+            raise _error("Se esperaba ',' o ']'", buffer, index)
+
+        try:
+            item, end = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            # El elemento está incompleto: leer más (con lecturas cada vez
+            # mayores para que los elementos enormes no se re-decodifiquen
+            # demasiadas veces)
+            if eof or not fill():
+                raise
+            chunk = min(chunk * 2, 64 * read_size)
+            continue
+
+        # Un número o literal puede estar cortado por el fin del buffer aunque
+        # raw_decode lo acepte ('1.' + '5e10'): solo se confía en él si le
+        # sigue ',' o ']' ya leído
+        if not eof and not isinstance(item, (dict, list, str)):
+            following = _skip_whitespace(buffer, end)
+            if (following >= len(buffer) or buffer[following] not in ',]') and fill():
+                continue
+
+        chunk = read_size
+        expecting_value = False
+        first = False
+        if with_offsets:
+            start = position
+            position += _utf8_length(buffer[index:end])
+            index = end
+            yield item, start, position
+        else:
+            index = end
+            yield item
+
+
+def iter_conversations(file_path, read_size=READ_SIZE, with_offsets=False):
+    """Itera las conversaciones de un archivo conversations.json una a una
+
+    Con with_offsets=True produce (conversación, byte_inicio, byte_fin).
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        yield from iter_json_array(f, read_size=read_size, with_offsets=with_offsets)
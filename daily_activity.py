@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Motor de actividad diaria
+Convierte daily_activity a un arreglo denso indexado por ordinal de día; las
+rachas, el calendario estilo GitHub y las series acumuladas salen de pasadas
+vectorizadas sobre ese arreglo (NumPy si está instalado)
+"""
+
+import calendar
+from datetime import date
+from itertools import accumulate, groupby
+
+# Cortes de nivel de actividad: 0 | 1-2 | 3-5 | 6-10 | 11+
+LEVEL_BOUNDARIES = (0, 2, 5, 10)
+
+# Días marcados especialmente en el calendario (lanzamiento de ChatGPT)
+SPECIAL_DAYS = {'2022-11-30': 'launch'}
+
+
+def _load_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def activity_level(count):
+    """Nivel de actividad (0-4) para un conteo diario"""
+    level = 0
+    for boundary in LEVEL_BOUNDARIES:
+        if count > boundary:
+            level += 1
+    return level
+
+
+def _year_dates(year):
+    """Todas las fechas 'YYYY-MM-DD' de un año, sin strftime por día"""
+    return [f"{year:04d}-{month:02d}-{day:02d}"
+            for month in range(1, 13)
+            for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+
+
+class DailyActivity:
+    """Actividad por día sobre un rango continuo de ordinales"""
+
+    def __init__(self, daily_activity, first_date=None, last_date=None):
+        self.np = _load_numpy()
+        self.daily_activity = daily_activity
+
+        ordinals = {date.fromisoformat(day).toordinal(): count for day, count in daily_activity.items()}
+        if first_date is not None and last_date is not None:
+            self.start = first_date.toordinal()
+            self.end = last_date.toordinal()
+        elif ordinals:
+            self.start = min(ordinals)
+            self.end = max(ordinals)
+        else:
+            self.start = self.end = None
+
+        if self.start is None:
+            self.counts = []
+            return
+
+        size = self.end - self.start + 1
+        offsets = [ordinal - self.start for ordinal in ordinals if self.start <= ordinal <= self.end]
+        values = [ordinals[offset + self.start] for offset in offsets]
+        if self.np:
+            self.counts = self.np.zeros(size, dtype=self.np.int64)
+            self.counts[offsets] = values
+        else:
+            self.counts = [0] * size
+            for offset, value in zip(offsets, values):
+                self.counts[offset] = value
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _date_str(self, offset):
+        return date.fromordinal(self.start + offset).isoformat()
+
+    def runs(self):
+        """Rachas de días activos/inactivos como (activo, inicio, longitud)"""
+        if not len(self.counts):
+            return []
+
+        np = self.np
+        if np:
+            active = self.counts > 0
+            changes = np.flatnonzero(active[1:] != active[:-1]) + 1
+            starts = np.concatenate(([0], changes))
+            lengths = np.diff(np.concatenate((starts, [len(active)])))
+            return list(zip(active[starts].tolist(), starts.tolist(), lengths.tolist()))
+
+        runs = []
+        offset = 0
+        for is_active, group in groupby(count > 0 for count in self.counts):
+            length = sum(1 for _ in group)
+            runs.append((is_active, offset, length))
+            offset += length
+        return runs
+
+    def streaks(self):
+        """Rachas y sus estadísticas (misma forma que calculate_streaks)"""
+        all_streaks = [{
+            'type': 'active' if is_active else 'inactive',
+            'length': length,
+            'start_date': self._date_str(start),
+            'end_date': self._date_str(start + length - 1)
+        } for is_active, start, length in self.runs()]
+
+        active = [s['length'] for s in all_streaks if s['type'] == 'active']
+        inactive = [s['length'] for s in all_streaks if s['type'] == 'inactive']
+
+        return {
+            'longest_active': max(active, default=0),
+            'longest_inactive': max(inactive, default=0),
+            'avg_active': round(sum(active) / len(active), 2) if active else 0,
+            'avg_inactive': round(sum(inactive) / len(inactive), 2) if inactive else 0,
+            'all_streaks': all_streaks
+        }
+
+    def active_days_summary(self):
+        """Días activos vs inactivos en el rango"""
+        total_days = len(self.counts)
+        if not total_days:
+            return {}
+
+        if self.np:
+            active_days = int(self.np.count_nonzero(self.counts))
+        else:
+            active_days = sum(1 for count in self.counts if count)
+        inactive_days = total_days - active_days
+
+        return {
+            'total_days': total_days,
+            'active_days': active_days,
+            'inactive_days': inactive_days,
+            'active_percentage': round(active_days / total_days * 100, 2),
+            'inactive_percentage': round(inactive_days / total_days * 100, 2)
+        }
+
+    def weekday_totals(self):
+        """Conversaciones por día de la semana (lunes a domingo)"""
+        totals = [0] * 7
+        if not len(self.counts):
+            return dict(zip(calendar.day_name, totals))
+
+        first_weekday = date.fromordinal(self.start).weekday()
+        if self.np:
+            weekdays = (self.np.arange(len(self.counts)) + first_weekday) % 7
+            totals = self.np.bincount(weekdays, weights=self.counts, minlength=7).astype(int).tolist()
+        else:
+            for offset, count in enumerate(self.counts):
+                totals[(offset + first_weekday) % 7] += count
+        return dict(zip(calendar.day_name, totals))
+
+    def github_calendar(self):
+        """Calendario estilo GitHub con todos los días de los años cubiertos"""
+        if not len(self.counts):
+            return []
+
+        first_year = date.fromordinal(self.start).year
+        last_year = date.fromordinal(self.end).year
+        np = self.np
+        github_data = []
+
+        for year in range(first_year, last_year + 1):
+            dates = _year_dates(year)
+
+            # Recortar el arreglo denso al año (los días fuera del rango valen 0)
+            year_start = date(year, 1, 1).toordinal() - self.start
+            lo = max(year_start, 0)
+            hi = min(year_start + len(dates), len(self.counts))
+            if np:
+                year_counts = np.zeros(len(dates), dtype=np.int64)
+                year_counts[lo - year_start:hi - year_start] = self.counts[lo:hi]
+                counts = year_counts.tolist()
+                levels = np.searchsorted(LEVEL_BOUNDARIES, year_counts, side='left').tolist()
+            else:
+                counts = [0] * len(dates)
+                counts[lo - year_start:hi - year_start] = self.counts[lo:hi]
+                levels = [activity_level(count) for count in counts]
+
+            github_data.extend({
+                'date': day,
+                'count': count,
+                'level': level,
+                'special_level': SPECIAL_DAYS.get(day)
+            } for day, count, level in zip(dates, counts, levels))
+
+        return github_data
+
+    def cumulative(self, extra_fields=None):
+        """Serie acumulada de conversaciones por día activo"""
+        sorted_days = sorted(self.daily_activity)
+        daily = [self.daily_activity[day] for day in sorted_days]
+        extra_fields = extra_fields or {}
+
+        return [dict({
+            'date': day,
+            'daily_conversations': count,
+            'cumulative_conversations': total
+        }, **extra_fields) for day, count, total in zip(sorted_days, daily, accumulate(daily))]
+
+    def timeline(self):
+        """Datos por día activo para el timeline"""
+        timeline = []
+        for day in sorted(self.daily_activity):
+            current = date.fromisoformat(day)
+            timeline.append({
+                'date': day,
+                'count': self.daily_activity[day],
+                'day_of_week': calendar.day_name[current.weekday()],
+                'month': calendar.month_name[current.month],
+                'year': current.year,
+                'week_of_year': current.isocalendar()[1]
+            })
+        return timeline
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Acceso directo al ZIP del export
+Lee conversations.json y demás archivos desde el ZIP sin extraerlo a disco
+"""
+
+import json
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from conversation_stream import iter_json_array
+
+CONVERSATIONS_NAME = "conversations.json"
+
+
+def is_export_zip(path):
+    """Indica si la ruta es un ZIP que contiene conversations.json"""
+    path = Path(path)
+    if not path.is_file() or not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as zf:
+        return find_member(zf, CONVERSATIONS_NAME) is not None
+
+
+def find_export_zip(data_dir="."):
+    """Busca un ZIP de export de ChatGPT en el directorio"""
+    for zip_path in sorted(Path(data_dir).glob("*.zip")):
+        if is_export_zip(zip_path):
+            return zip_path
+    return None
+
+
+def find_member(zf, rel_path):
+    """Resuelve una ruta relativa a un miembro del ZIP
+
+    Los exports pueden venir con o sin carpeta raíz, así que se acepta tanto
+    el nombre exacto como cualquier miembro que termine en esa ruta.
+    """
+    rel_path = rel_path.lstrip('/')
+    if not rel_path:
+        return None
+
+    try:
+        info = zf.getinfo(rel_path)
+        if not info.is_dir():
+            return info
+    except KeyError:
+        pass
+
+    suffix = '/' + rel_path
+    for info in zf.infolist():
+        if not info.is_dir() and info.filename.endswith(suffix):
+            return info
+    return None
+
+
+@contextmanager
+def open_member(zip_path, rel_path):
+    """Abre un miembro del ZIP como stream binario (sin extraerlo)"""
+    with zipfile.ZipFile(zip_path) as zf:
+        info = find_member(zf, rel_path)
+        if info is None:
+            raise FileNotFoundError(f"{rel_path} no está en {zip_path}")
+        with zf.open(info) as f:
+            yield f
+
+
+def iter_zip_conversations(zip_path, with_offsets=False):
+    """Itera las conversaciones directamente desde el ZIP
+
+    Con with_offsets=True produce (conversación, byte_inicio, byte_fin)
+    dentro del miembro conversations.json.
+    """
+    with open_member(zip_path, CONVERSATIONS_NAME) as f:
+        yield from iter_json_array(f, with_offsets=with_offsets)
+
+
+def load_zip_conversations(zip_path):
+    """Carga conversations.json completo desde el ZIP"""
+    with open_member(zip_path, CONVERSATIONS_NAME) as f:
+        return json.load(f)
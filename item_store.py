@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Listas por conversación fuera de chatgpt_stats.json
+Los títulos, largos y complejidad de cada conversación y la lista de rachas
+crecen con el export; se guardan en SQLite (chatgpt_items.sqlite) y el
+servidor los entrega paginados, ordenados y filtrados en /api/items/.
+chatgpt_stats.json conserva solo los agregados, de tamaño constante.
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+ITEMS_NAME = "chatgpt_items.sqlite"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Colección -> columnas (nombre, tipo SQLite). 'position' es el orden original.
+COLLECTIONS = {
+    'conversations': (('position', 'INTEGER'), ('title', 'TEXT'), ('message_count', 'INTEGER')),
+    'complexity': (('position', 'INTEGER'), ('title', 'TEXT'), ('sentiment', 'REAL'),
+                   ('sentiment_category', 'TEXT'), ('message_count', 'INTEGER'),
+                   ('word_count', 'INTEGER'), ('avg_message_length', 'REAL')),
+    'streaks': (('position', 'INTEGER'), ('type', 'TEXT'), ('length', 'INTEGER'),
+                ('start_date', 'TEXT'), ('end_date', 'TEXT')),
+}
+
+# Columnas de texto que se buscan con ?q=
+SEARCH_COLUMNS = {'conversations': 'title', 'complexity': 'title'}
+
+
+class ItemQueryError(ValueError):
+    """Parámetros de consulta inválidos (orden o filtro desconocido)"""
+
+
+def items_path_for(stats_path):
+    """Ruta del almacén de listas junto al archivo de estadísticas"""
+    return Path(stats_path).parent / ITEMS_NAME
+
+
+def split_items(stats):
+    """Separa las listas por conversación de las estadísticas
+
+    Devuelve (estadísticas sin las listas, {colección: filas}). stats no se
+    modifica; en su lugar queda 'item_counts' con el tamaño de cada colección.
+    """
+    slim = dict(stats)
+    titles = slim.pop('conversation_titles', None) or []
+    lengths = slim.pop('conversation_lengths', None) or []
+    complexity = slim.pop('conversation_complexity', None) or []
+
+    streaks = []
+    if isinstance(slim.get('days_analysis'), dict) and 'streaks' in slim['days_analysis']:
+        slim['days_analysis'] = dict(slim['days_analysis'])
+        streaks = slim['days_analysis'].pop('streaks') or []
+
+    collections = {
+        'conversations': [(position, title, message_count)
+                          for position, (title, message_count) in enumerate(zip(titles, lengths))],
+        'complexity': [(position, conv['title'], conv['sentiment'], conv.get('sentiment_category'),
+                        conv['message_count'], conv['word_count'], conv['avg_message_length'])
+                       for position, conv in enumerate(complexity)],
+        'streaks': [(position, streak['type'], streak['length'], streak['start_date'], streak['end_date'])
+                    for position, streak in enumerate(streaks)],
+    }
+    slim['item_counts'] = {name: len(rows) for name, rows in collections.items()}
+    return slim, collections
+
+
+def write_items(collections, path):
+    """Escribe las colecciones en SQLite (atómico: temporal + renombrar)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    try:
+        with closing(sqlite3.connect(str(tmp_path))) as conn:
+            for name, columns in COLLECTIONS.items():
+                definition = ', '.join(f"{column} {kind}" for column, kind in columns)
+                conn.execute(f"CREATE TABLE {name} ({definition})")
+                placeholders = ', '.join('?' for _ in columns)
+                conn.executemany(f"INSERT INTO {name} VALUES ({placeholders})", collections.get(name, ()))
+            conn.commit()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    return path
+
+
+def save_items(stats, stats_path):
+    """Guarda las listas junto a stats_path y devuelve las estadísticas sin ellas"""
+    slim, collections = split_items(stats)
+    write_items(collections, items_path_for(stats_path))
+    return slim
+
+
+def _as_int(value, name, default):
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ItemQueryError(f"{name} debe ser un entero")
+
+
+def query_items(path, collection, params):
+    """Página de una colección según los parámetros de la URL
+
+    params (dict de valores simples):
+      page, per_page   paginación (per_page hasta MAX_PAGE_SIZE)
+      sort, order      columna de orden y 'asc'/'desc'
+      q                texto contenido en el título
+      min_<col>, max_<col>   rango numérico
+      <col>            igualdad (columnas de texto, p. ej. type=active)
+    """
+    if collection not in COLLECTIONS:
+        raise KeyError(collection)
+    columns = dict(COLLECTIONS[collection])
+
+    page = max(1, _as_int(params.get('page'), 'page', 1))
+    per_page = min(MAX_PAGE_SIZE, max(1, _as_int(params.get('per_page'), 'per_page', DEFAULT_PAGE_SIZE)))
+
+    sort = params.get('sort') or 'position'
+    if sort not in columns:
+        raise ItemQueryError(f"No se puede ordenar por '{sort}'")
+    order = (params.get('order') or 'asc').lower()
+    if order not in ('asc', 'desc'):
+        raise ItemQueryError("order debe ser 'asc' o 'desc'")
+
+    where = []
+    args = []
+    for key, value in params.items():
+        if key in ('page', 'per_page', 'sort', 'order') or value in (None, ''):
+            continue
+        if key == 'q' and collection in SEARCH_COLUMNS:
+            where.append(f"{SEARCH_COLUMNS[collection]} LIKE ? ESCAPE '\\'")
+            escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            args.append(f"%{escaped}%")
+        elif key[:4] in ('min_', 'max_') and columns.get(key[4:]) in ('INTEGER', 'REAL'):
+            try:
+                number = float(value)
+            except ValueError:
+                raise ItemQueryError(f"{key} debe ser un número")
+            where.append(f"{key[4:]} {'>=' if key.startswith('min_') else '<='} ?")
+            args.append(number)
+        elif columns.get(key) == 'TEXT':
+            where.append(f"{key} = ?")
+            args.append(value)
+        else:
+            raise ItemQueryError(f"Filtro desconocido: {key}")
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ''
+
+    # Solo lectura: el parser reemplaza el archivo completo al regenerarlo
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM {collection}{where_sql}", args).fetchone()[0]
+        cursor = conn.execute(
+            f"SELECT * FROM {collection}{where_sql} ORDER BY {sort} {order}, position "
+            f"LIMIT ? OFFSET ?", args + [per_page, (page - 1) * per_page])
+        names = [description[0] for description in cursor.description]
+        items = [dict(zip(names, row)) for row in cursor]
+
+    return {
+        'collection': collection,
+        'items': items,
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'pages': (total + per_page - 1) // per_page,
+        'sort': sort,
+        'order': order
+    }
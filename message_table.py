@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Tabla columnar de conversaciones
+Guarda una fila compacta por conversación, con los agregados de sus
+mensajes, en arreglos tipados; las estadísticas finales salen de reducciones
+sobre columnas en vez de listas de objetos Python
+"""
+
+import math
+import statistics
+from array import array
+from datetime import datetime
+
+NAN = float('nan')
+
+
+def _load_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+class MessageTable:
+    """Agregados por conversación en columnas tipadas
+
+    Una fila por conversación: create_time, número de mensajes, totales de
+    caracteres y palabras, y suma y cantidad de sentimientos calculados. Los
+    mensajes no tienen filas propias: add_message solo suma a su
+    conversación (las distribuciones por mensaje están en las estadísticas
+    en streaming). Las filas no dependen de la posición de la conversación en
+    el export, así que sirven para la caché incremental.
+    """
+
+    def __init__(self):
+        self.conv_create_time = array('d')
+        self.conv_message_count = array('I')
+        self.conv_char_count = array('Q')
+        self.conv_word_count = array('Q')
+        self.conv_sentiment_sum = array('d')
+        self.conv_scored_count = array('I')
+
+    @property
+    def num_conversations(self):
+        return len(self.conv_create_time)
+
+    # Construcción
+
+    def add_conversation(self, create_time=None):
+        """Agrega una conversación y devuelve su índice"""
+        self.conv_create_time.append(create_time if create_time else NAN)
+        self.conv_message_count.append(0)
+        self.conv_char_count.append(0)
+        self.conv_word_count.append(0)
+        self.conv_sentiment_sum.append(0.0)
+        self.conv_scored_count.append(0)
+        return len(self.conv_create_time) - 1
+
+    def set_message_count(self, conv, count):
+        self.conv_message_count[conv] = count
+
+    def add_message(self, conv, char_length, word_count, sentiment=NAN):
+        """Suma la longitud y el sentimiento de un mensaje a su conversación"""
+        self.conv_char_count[conv] += char_length
+        self.conv_word_count[conv] += word_count
+        if not math.isnan(sentiment):
+            self.conv_sentiment_sum[conv] += sentiment
+            self.conv_scored_count[conv] += 1
+
+    def extend(self, other):
+        """Agrega al final las filas de otra tabla (p. ej. de un proceso hijo)"""
+        self.conv_create_time.extend(other.conv_create_time)
+        self.conv_message_count.extend(other.conv_message_count)
+        self.conv_char_count.extend(other.conv_char_count)
+        self.conv_word_count.extend(other.conv_word_count)
+        self.conv_sentiment_sum.extend(other.conv_sentiment_sum)
+        self.conv_scored_count.extend(other.conv_scored_count)
+
+    # Reducciones
+
+    def date_range(self):
+        """(primera, última) fecha de conversación, o None"""
+        timestamps = [ts for ts in self.conv_create_time if not math.isnan(ts)]
+        if not timestamps:
+            return None
+        return datetime.fromtimestamp(min(timestamps)), datetime.fromtimestamp(max(timestamps))
+
+    def mean_conversation_length(self):
+        count = len(self.conv_message_count)
+        return sum(self.conv_message_count) / count if count else 0
+
+    def conversation_aggregates(self):
+        """Agregados por conversación con al menos un sentimiento calculado
+
+        Devuelve columnas paralelas: message_count, word_count,
+        avg_message_length y sentiment (media).
+        """
+        np = _load_numpy()
+        if np:
+            scored = np.frombuffer(self.conv_scored_count, dtype=np.uint32)
+            keep = scored > 0
+            counts = np.frombuffer(self.conv_message_count, dtype=np.uint32)[keep]
+            chars = np.frombuffer(self.conv_char_count, dtype=np.uint64)[keep]
+            words = np.frombuffer(self.conv_word_count, dtype=np.uint64)[keep]
+            sums = np.frombuffer(self.conv_sentiment_sum, dtype=np.float64)[keep]
+            return {
+                'message_count': counts.tolist(),
+                'word_count': words.tolist(),
+                'avg_message_length': (chars / counts).tolist(),
+                'sentiment': (sums / scored[keep]).tolist()
+            }
+
+        keep = [conv for conv, scored in enumerate(self.conv_scored_count) if scored]
+        return {
+            'message_count': [self.conv_message_count[conv] for conv in keep],
+            'word_count': [self.conv_word_count[conv] for conv in keep],
+            'avg_message_length': [self.conv_char_count[conv] / self.conv_message_count[conv] for conv in keep],
+            'sentiment': [self.conv_sentiment_sum[conv] / self.conv_scored_count[conv] for conv in keep]
+        }
+
+
+def correlation(xs, ys):
+    """Correlación de Pearson (0 si no está definida)"""
+    if len(xs) < 2 or len(ys) < 2:
+        return None
+    np = _load_numpy()
+    try:
+        if np:
+            value = float(np.corrcoef(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))[0, 1])
+            return 0 if math.isnan(value) else value
+        return statistics.correlation(xs, ys)
+    except (ValueError, statistics.StatisticsError, ZeroDivisionError):
+        return 0
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Caché de resultados NLP por mensaje
+La polaridad de TextBlob depende solo del texto, así que se guarda en
+SQLite con clave hash(tipo + texto + versión del analizador) y expulsión LRU.
+Solo se guarda el tipo 'sentiment': la tokenización ya se hace una vez por
+mensaje con el tokenizador compartido (text_normalizer.py)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# Incrementar cuando cambie la forma de calcular sentimiento o tokens
+NLP_CACHE_VERSION = 1
+
+# Entradas máximas antes de expulsar las menos usadas
+DEFAULT_MAX_ENTRIES = 500_000
+
+# Escrituras acumuladas antes de confirmar en disco
+FLUSH_EVERY = 5000
+
+
+def analyzer_version():
+    """Versión combinada de la caché y de las librerías NLP instaladas"""
+    versions = [str(NLP_CACHE_VERSION)]
+    for module_name in ('textblob', 'nltk'):
+        try:
+            module = __import__(module_name)
+            versions.append(f"{module_name}-{getattr(module, '__version__', '?')}")
+        except ImportError:
+            versions.append(f"{module_name}-none")
+    return '|'.join(versions)
+
+
+class NLPCache:
+    """Caché persistente de resultados NLP con tamaño máximo y expulsión LRU"""
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, version=None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.version = version or analyzer_version()
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT, last_used REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.conn.commit()
+        self._memory = {}
+        self._pending_puts = {}
+        self._pending_touches = set()
+
+    def _key(self, kind, text):
+        digest = hashlib.sha1()
+        digest.update(self.version.encode('utf-8'))
+        digest.update(kind.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, kind, text):
+        """Devuelve el resultado guardado para (tipo, texto) o None"""
+        key = self._key(kind, text)
+        if key in self._memory:
+            return self._memory[key]
+
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        value = json.loads(row[0])
+        self._remember(key, value)
+        self._pending_touches.add(key)
+        return value
+
+    def put(self, kind, text, value):
+        """Guarda el resultado para (tipo, texto)"""
+        key = self._key(kind, text)
+        self._remember(key, value)
+        self._pending_puts[key] = json.dumps(value, ensure_ascii=False)
+        if len(self._pending_puts) + len(self._pending_touches) >= FLUSH_EVERY:
+            self.flush()
+
+    def _remember(self, key, value):
+        # Memoria local acotada para los textos repetidos dentro de la ejecución
+        if len(self._memory) >= FLUSH_EVERY * 10:
+            self._memory.clear()
+        self._memory[key] = value
+
+    def flush(self):
+        """Escribe en disco los resultados nuevos y expulsa los menos usados"""
+        if not self._pending_puts and not self._pending_touches:
+            return
+
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in self._pending_puts.items()]
+            )
+            self.conn.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(now, key) for key in self._pending_touches]
+            )
+            count = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                # Expulsar hasta el 90% del límite para no hacerlo en cada flush
+                excess = count - int(self.max_entries * 0.9)
+                self.conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY last_used, rowid LIMIT ?)", (excess,)
+                )
+        self._pending_puts.clear()
+        self._pending_touches.clear()
+
+    def close(self):
+        """Escribe lo pendiente y cierra la base de datos"""
+        self.flush()
+        self.conn.close()
+
+
+_open_caches = {}
+
+
+def open_nlp_cache(path):
+    """Devuelve la caché para la ruta, reutilizándola dentro del mismo proceso"""
+    key = (os.getpid(), str(path))
+    if key not in _open_caches:
+        _open_caches[key] = NLPCache(path)
+    return _open_caches[key]
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Carga diferida de dependencias NLP
+TextBlob y NLTK se importan la primera vez que un análisis los necesita;
+importar los módulos del proyecto no toca la red ni imprime nada
+"""
+
+import warnings
+
+_MISSING = object()
+_textblob_class = _MISSING
+
+
+def get_textblob():
+    """Devuelve la clase TextBlob, o None si no está instalada"""
+    global _textblob_class
+    if _textblob_class is _MISSING:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                from textblob import TextBlob
+            _textblob_class = TextBlob
+        except ImportError:
+            _textblob_class = None
+            print("⚠️  TextBlob no disponible. El análisis de sentimientos estará limitado.")
+    return _textblob_class
+
+
+def nltk_stopwords(languages=('spanish', 'english')):
+    """Stopwords de NLTK, o None si NLTK o el corpus no están disponibles
+
+    No se descarga nada: los recursos se instalan con setup.py o con
+    nltk.download('stopwords').
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            from nltk.corpus import stopwords
+        words = []
+        for language in languages:
+            words.extend(stopwords.words(language))
+        return words
+    except ImportError:
+        print("⚠️  NLTK no disponible. Se usarán stopwords básicas.")
+    except LookupError:
+        print("⚠️  Corpus de stopwords de NLTK no instalado. Se usarán stopwords básicas.")
+    return None
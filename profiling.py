@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Perfilado por etapa (--profile)
+Mide tiempo de pared, tiempo de CPU y número de llamadas de cada etapa del
+pipeline y de cada evento de cada analizador, y opcionalmente agrega las
+funciones más costosas (cProfile) o los puntos de mayor asignación de
+memoria (tracemalloc). El reporte es un JSON junto al archivo de estadísticas.
+"""
+
+import json
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_MODES = ('basic', 'cprofile', 'tracemalloc')
+
+# Entradas de cProfile / tracemalloc incluidas en el reporte
+TOP_ENTRIES = 30
+
+
+def profile_path_for(stats_path):
+    """Ruta del reporte (p. ej. chatgpt_stats.profile.json)"""
+    stats_path = Path(stats_path)
+    name = stats_path.name
+    for suffix in ('.gz', '.zst', '.json'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return stats_path.with_name(name + '.profile.json')
+
+
+class Profiler:
+    """Acumula tiempos por etapa; mode agrega cProfile o tracemalloc"""
+
+    def __init__(self, mode='basic'):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfilado desconocido: {mode}")
+        self.mode = mode
+        self.timings = {}
+        self._start_wall = None
+        self._start_cpu = None
+        self._cprofile = None
+
+    def _record(self, name, wall, cpu):
+        entry = self.timings.get(name)
+        if entry is None:
+            entry = self.timings[name] = {'wall': 0.0, 'cpu': 0.0, 'calls': 0}
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        entry['calls'] += 1
+        return entry
+
+    def start(self):
+        """Inicia el reloj global (y cProfile/tracemalloc si corresponde)"""
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if self.mode == 'cprofile':
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.mode == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Mide una etapa; con tracemalloc guarda además su pico de memoria"""
+        if self.mode == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self._record(name, time.perf_counter() - wall, time.process_time() - cpu)
+            if self.mode == 'tracemalloc':
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                entry['peak_memory_mb'] = round(max(peak, entry.get('peak_memory_mb', 0)), 2)
+
+    def timed(self, name, func):
+        """Envuelve func para acumular su tiempo bajo name"""
+        record = self._record
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+
+        def wrapper(*args, **kwargs):
+            wall = perf_counter()
+            cpu = process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - wall, process_time() - cpu)
+        return wrapper
+
+    def _cprofile_top(self):
+        import pstats
+        self._cprofile.disable()
+        stats = pstats.Stats(self._cprofile)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+        return [{
+            'function': f"{path}:{line}({func})",
+            'calls': calls,
+            'tottime': round(tottime, 4),
+            'cumtime': round(cumtime, 4)
+        } for (path, line, func), (_, calls, tottime, cumtime, _) in rows]
+
+    def _tracemalloc_top(self):
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        top = snapshot.statistics('lineno')[:TOP_ENTRIES]
+        return {
+            'current_mb': round(current / (1024 * 1024), 2),
+            'top_allocations': [{
+                'location': str(stat.traceback[0]),
+                'size_mb': round(stat.size / (1024 * 1024), 3),
+                'count': stat.count
+            } for stat in top]
+        }
+
+    def report(self, **metadata):
+        """Reporte con los totales, las etapas y los analizadores"""
+        total_wall = time.perf_counter() - self._start_wall if self._start_wall else None
+        total_cpu = time.process_time() - self._start_cpu if self._start_cpu else None
+
+        def rounded(entry):
+            return {key: round(value, 6) if isinstance(value, float) else value
+                    for key, value in entry.items()}
+
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mode': self.mode,
+            **metadata,
+            'total': {'wall': round(total_wall or 0, 6), 'cpu': round(total_cpu or 0, 6)},
+            'stages': {name: rounded(entry) for name, entry in self.timings.items()
+                       if not name.startswith('analyzer.')},
+            'analyzers': {name[len('analyzer.'):]: rounded(entry) for name, entry in self.timings.items()
+                          if name.startswith('analyzer.')}
+        }
+        messages = metadata.get('messages')
+        if messages and total_wall:
+            report['msgs_per_sec'] = round(messages / total_wall, 1)
+        if self._cprofile is not None:
+            report['cprofile_top'] = self._cprofile_top()
+        if self.mode == 'tracemalloc':
+            report['tracemalloc'] = self._tracemalloc_top()
+        return report
+
+    def write(self, path, **metadata):
+        """Guarda el reporte JSON y devuelve su ruta"""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**metadata), f, indent=2, ensure_ascii=False)
+        return path
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Búsqueda de texto completo en los mensajes
+El parser puede generar chatgpt_search.sqlite, un índice invertido SQLite
+FTS5 con el texto de cada mensaje, su rol, fecha y conversación. El servidor
+lo consulta en /api/search?q= con resultados ordenados por relevancia (BM25).
+"""
+
+import os
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from analysis_engine import extract_text
+from settings import config_value
+
+SEARCH_NAME = "chatgpt_search.sqlite"
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Mensajes acumulados antes de cada inserción
+INSERT_BATCH_SIZE = 2000
+
+# Marcas de los términos encontrados en el fragmento de cada resultado
+HIGHLIGHT = ('**', '**')
+
+_TERM_PATTERN = re.compile(r'\w+\*?')
+
+
+def configured_search_index():
+    """ANALYSIS_CONFIG['build_search_index'] en config.py (por defecto False)"""
+    return bool(config_value('ANALYSIS_CONFIG', 'build_search_index', False))
+
+
+def fts5_available():
+    """Indica si el SQLite de Python incluye FTS5"""
+    try:
+        with closing(sqlite3.connect(':memory:')) as conn:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SearchIndexBuilder:
+    """Construye el índice mientras se leen las conversaciones
+
+    Se escribe en un temporal que reemplaza al índice anterior en close().
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+        self.conn = sqlite3.connect(str(self.tmp_path))
+        # Archivo temporal: no hace falta diario ni sincronizar
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("CREATE TABLE conversations (position INTEGER PRIMARY KEY, id TEXT, title TEXT)")
+        self.conn.execute(
+            "CREATE VIRTUAL TABLE messages USING fts5("
+            "text, conversation UNINDEXED, role UNINDEXED, create_time UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        self.conversations = 0
+        self.messages = 0
+        self._pending = []
+
+    def add_conversation(self, conversation):
+        """Indexa los mensajes con texto de una conversación (todos los roles)"""
+        position = self.conversations
+        self.conversations += 1
+        self.conn.execute("INSERT INTO conversations VALUES (?, ?, ?)", (
+            position,
+            conversation.get('id') or f"conv_{position}",
+            conversation.get('title') or 'Sin título'
+        ))
+
+        for msg_data in conversation.get('mapping', {}).values():
+            message = msg_data.get('message')
+            if not message:
+                continue
+            text = extract_text(message.get('content', {}))
+            if not text.strip():
+                continue
+            role = (message.get('author') or {}).get('role', 'unknown')
+            self._pending.append((text, position, role, message.get('create_time')))
+
+        if len(self._pending) >= INSERT_BATCH_SIZE:
+            self._flush()
+
+    def wrap(self, conversations):
+        """Indexa cada conversación al pasar por el iterador"""
+        for conversation in conversations:
+            self.add_conversation(conversation)
+            yield conversation
+
+    def _flush(self):
+        self.conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?)", self._pending)
+        self.messages += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        """Compacta el índice y lo deja en su ruta definitiva"""
+        self._flush()
+        self.conn.execute("INSERT INTO messages (messages) VALUES ('optimize')")
+        self.conn.commit()
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self.conn.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+def build_match_query(text):
+    """Convierte el texto del usuario en una consulta FTS5 segura
+
+    Cada palabra se busca literal (todas deben aparecer); 'palabra*' busca
+    por prefijo. Devuelve None si no hay palabras.
+    """
+    terms = []
+    for term in _TERM_PATTERN.findall(text or ''):
+        word = term.rstrip('*')
+        quoted = '"' + word.replace('"', '""') + '"'
+        terms.append(quoted + '*' if term.endswith('*') else quoted)
+    return ' '.join(terms) or None
+
+
+def search(path, text, page=1, per_page=DEFAULT_PAGE_SIZE, role=None):
+    """Página de mensajes que contienen todas las palabras de text
+
+    Los resultados van del más al menos relevante (BM25) con un fragmento
+    del mensaje donde aparecen los términos marcados con HIGHLIGHT.
+    """
+    match = build_match_query(text)
+    page = max(1, page)
+    per_page = min(MAX_PAGE_SIZE, max(1, per_page))
+    result = {'query': text, 'results': [], 'total': 0, 'page': page, 'per_page': per_page, 'pages': 0}
+    if match is None:
+        return result
+
+    where = "messages MATCH ?"
+    args = [match]
+    if role:
+        where += " AND role = ?"
+        args.append(role)
+
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as conn:
+        result['total'] = conn.execute(f"SELECT COUNT(*) FROM messages WHERE {where}", args).fetchone()[0]
+        rows = conn.execute(
+            "SELECT conversations.id, conversations.title, messages.role, messages.create_time, "
+            "snippet(messages, 0, ?, ?, '…', 16), bm25(messages) AS rank "
+            "FROM messages JOIN conversations ON conversations.position = messages.conversation "
+            f"WHERE {where} ORDER BY rank LIMIT ? OFFSET ?",
+            [*HIGHLIGHT, *args, per_page, (page - 1) * per_page]
+        )
+        result['results'] = [{
+            'conversation_id': conv_id,
+            'title': title,
+            'role': msg_role,
+            'create_time': create_time,
+            'snippet': snippet,
+            'score': -rank
+        } for conv_id, title, msg_role, create_time, snippet, rank in rows]
+
+    result['pages'] = (result['total'] + per_page - 1) // per_page
+    return result
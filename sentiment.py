@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Motores de análisis de sentimientos
+'textblob' analiza mensaje a mensaje con TextBlob; 'lexicon' puntúa lotes
+de tokens contra un léxico de polaridad precargado (mucho más rápido)
+"""
+
+from pathlib import Path
+
+from settings import config_value
+
+SENTIMENT_BACKENDS = ('textblob', 'lexicon')
+
+# Umbrales de clasificación (los mismos del análisis original)
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+# Palabras que invierten la polaridad de la siguiente palabra con sentimiento
+# ("t" viene de contracciones como "don't" tras la tokenización)
+NEGATIONS = frozenset(['not', 'no', 'never', 't', 'nunca', 'jamás', 'tampoco'])
+NEGATION_FACTOR = -0.5
+
+# Léxico mínimo para cuando no está disponible el léxico de TextBlob
+FALLBACK_LEXICON = {
+    'good': 0.7, 'great': 0.8, 'excellent': 1.0, 'amazing': 0.6, 'awesome': 1.0,
+    'nice': 0.6, 'love': 0.5, 'best': 1.0, 'better': 0.5, 'happy': 0.8,
+    'perfect': 1.0, 'wonderful': 1.0, 'thanks': 0.2, 'useful': 0.3, 'cool': 0.35,
+    'interesting': 0.5, 'easy': 0.43, 'correct': 0.0, 'fine': 0.42, 'glad': 0.5,
+    'bad': -0.7, 'worse': -0.4, 'worst': -1.0, 'terrible': -1.0, 'awful': -1.0,
+    'wrong': -0.5, 'hate': -0.8, 'sad': -0.5, 'horrible': -1.0, 'poor': -0.4,
+    'difficult': -0.5, 'hard': -0.29, 'stupid': -0.8, 'annoying': -0.8, 'broken': -0.4,
+    'bueno': 0.7, 'buena': 0.7, 'genial': 0.8, 'excelente': 1.0, 'perfecto': 1.0,
+    'gracias': 0.2, 'increíble': 0.6, 'útil': 0.3, 'fácil': 0.43, 'feliz': 0.8,
+    'malo': -0.7, 'mala': -0.7, 'pésimo': -1.0, 'peor': -0.4,
+    'difícil': -0.5, 'error': -0.3, 'triste': -0.5, 'odio': -0.8, 'incorrecto': -0.5
+}
+
+
+def _load_numpy():
+    """Importa NumPy solo cuando se construye un léxico (None si no está)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def sentiment_bucket(score):
+    """Clasifica una polaridad en 'positive', 'negative' o 'neutral'"""
+    if score > POSITIVE_THRESHOLD:
+        return 'positive'
+    if score < NEGATIVE_THRESHOLD:
+        return 'negative'
+    return 'neutral'
+
+
+def _textblob_lexicon():
+    """Carga las polaridades del léxico en inglés de TextBlob (promediando sentidos)"""
+    try:
+        import textblob
+    except ImportError:
+        return None
+
+    lexicon_file = Path(textblob.__file__).parent / 'en' / 'en-sentiment.xml'
+    if not lexicon_file.exists():
+        return None
+
+    import xml.etree.ElementTree as ET
+
+    totals = {}
+    for _, element in ET.iterparse(str(lexicon_file)):
+        if element.tag == 'word' and element.get('form'):
+            form = element.get('form').lower()
+            polarity = float(element.get('polarity', 0))
+            total, count = totals.get(form, (0.0, 0))
+            totals[form] = (total + polarity, count + 1)
+        element.clear()
+
+    return {form: total / count for form, (total, count) in totals.items()}
+
+
+class SentimentLexicon:
+    """Puntúa lotes de mensajes tokenizados con un léxico de polaridad
+
+    La polaridad de un mensaje es la media de las polaridades de sus
+    palabras con sentimiento, como hace TextBlob.
+    """
+
+    def __init__(self, lexicon):
+        # Las palabras neutras del léxico también cuentan en la media (como en TextBlob)
+        words = list(lexicon)
+        self.vocabulary = {word: index for index, word in enumerate(words)}
+        polarities = [lexicon[word] for word in words]
+        self.np = _load_numpy()
+        self.polarities = self.np.array(polarities, dtype=self.np.float64) if self.np else polarities
+
+    def score_batch(self, token_lists):
+        """Devuelve la polaridad de cada lista de tokens (ya en minúsculas)"""
+        vocabulary = self.vocabulary
+        ids = []
+        owners = []
+        weights = []
+
+        for owner, tokens in enumerate(token_lists):
+            negate = False
+            for token in tokens:
+                index = vocabulary.get(token)
+                if index is not None:
+                    ids.append(index)
+                    owners.append(owner)
+                    weights.append(NEGATION_FACTOR if negate else 1.0)
+                    negate = False
+                elif token in NEGATIONS:
+                    negate = True
+
+        size = len(token_lists)
+        np = self.np
+        if np:
+            if not ids:
+                return [0.0] * size
+            values = self.polarities[np.array(ids)] * np.array(weights)
+            owners = np.array(owners)
+            sums = np.bincount(owners, weights=values, minlength=size)
+            counts = np.bincount(owners, minlength=size)
+            scores = np.divide(sums, counts, out=np.zeros(size), where=counts > 0)
+            return np.clip(scores, -1.0, 1.0).tolist()
+
+        sums = [0.0] * size
+        counts = [0] * size
+        for index, owner, weight in zip(ids, owners, weights):
+            sums[owner] += self.polarities[index] * weight
+            counts[owner] += 1
+        return [max(-1.0, min(1.0, total / count)) if count else 0.0
+                for total, count in zip(sums, counts)]
+
+
+_lexicon = None
+
+
+def get_sentiment_lexicon():
+    """Léxico compartido: el de TextBlob si está instalado, si no el mínimo"""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = SentimentLexicon(_textblob_lexicon() or FALLBACK_LEXICON)
+    return _lexicon
+
+
+def configured_backend():
+    """Motor elegido en ANALYSIS_CONFIG['sentiment_backend'] (config.py)"""
+    backend = config_value('ANALYSIS_CONFIG', 'sentiment_backend', 'textblob')
+    return backend if backend in SENTIMENT_BACKENDS else 'textblob'
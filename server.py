@@ -4,48 +4,715 @@ ChatGPT Analytics Pro - Servidor Web Generalizado
 Servidor HTTP para servir el reporte interactivo
 """
 
+import email.utils
 import http.server
-import socketserver
+import io
+import json
+import urllib.parse
 import webbrowser
 import os
+import selectors
+import signal
+import socket
 import sys
 import threading
 import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+from asset_cache import MIN_COMPRESS_SIZE, choose_encoding, compress, get_asset_cache, is_compressible
+from conversation_index import INDEX_NAME, open_index
+from item_store import ITEMS_NAME, ItemQueryError, query_items
+from search_index import SEARCH_NAME, search
+from export_archive import find_member
+from stats_writer import find_precompressed, open_decompressed, stats_variants
+from settings import config_value
+
+# Valores por defecto (se pueden cambiar en SERVER_CONFIG de config.py)
+DEFAULT_MAX_WORKERS = 16
+# Clientes de /api/events a la vez (cada uno con un hilo propio, fuera del pool)
+DEFAULT_MAX_EVENT_CLIENTS = 32
+# Segundos que una conexión keep-alive inactiva se mantiene abierta
+KEEPALIVE_TIMEOUT = 15
+# Segundos que se esperan las peticiones en curso al detener el servidor
+SHUTDOWN_TIMEOUT = 10
+# Segundos entre comentarios de keep-alive en /api/events
+EVENTS_HEARTBEAT = 15
+# Eventos recientes que se reenvían a un cliente que se reconecta
+EVENTS_HISTORY = 20
+
+def configured_server_option(key, default):
+    """Valor de SERVER_CONFIG[key] en config.py (o default)"""
+    return config_value('SERVER_CONFIG', key, default)
+
+class EventBroadcaster:
+    """Eventos del modo watch para los clientes de /api/events (SSE)
+    
+    Cada evento tiene un id creciente; un cliente que se reconecta con
+    Last-Event-ID recibe los que se perdió mientras sigan en el historial.
+    Cada cliente ocupa un hilo de events_executor (no del pool de
+    peticiones), así que se admiten a lo sumo max_clients a la vez.
+    """
+    
+    def __init__(self, max_clients, history=EVENTS_HISTORY):
+        self.max_clients = max_clients
+        self.clients = 0
+        self.closed = False
+        self._events = deque(maxlen=history)
+        self._next_id = 1
+        self._condition = threading.Condition()
+    
+    @property
+    def last_id(self):
+        with self._condition:
+            return self._next_id - 1
+    
+    def publish(self, event, data):
+        with self._condition:
+            self._events.append((self._next_id, event, json.dumps(data, ensure_ascii=False)))
+            self._next_id += 1
+            self._condition.notify_all()
+    
+    def wait(self, after_id, timeout):
+        """Eventos con id mayor que after_id; espera hasta timeout si no hay"""
+        with self._condition:
+            if not self.closed and (not self._events or self._events[-1][0] <= after_id):
+                self._condition.wait(timeout)
+            return [event for event in self._events if event[0] > after_id]
+    
+    def acquire(self):
+        """Reserva un lugar para un cliente (False si no quedan)"""
+        with self._condition:
+            if self.closed or self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+    
+    def release(self):
+        with self._condition:
+            self.clients -= 1
+    
+    def close(self):
+        """Termina las conexiones abiertas (al detener el servidor)"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+class ChatGPTHTTPServer(http.server.HTTPServer):
+    """Servidor HTTP concurrente con un número máximo de hilos
+    
+    Cada petición se atiende en un hilo del pool; si todos están ocupados
+    las nuevas esperan en cola. Entre peticiones una conexión keep-alive no
+    ocupa un hilo: queda en un selector y vuelve al pool cuando llegan datos
+    (o se cierra tras KEEPALIVE_TIMEOUT segundos inactiva). Los clientes de
+    /api/events usan su propio pool (events_executor). Al detenerse deja de
+    aceptar conexiones, cierra las keep-alive y espera a los hilos hasta
+    shutdown_timeout segundos.
+    """
+    
+    def __init__(self, server_address, handler_class, max_workers=None, shutdown_timeout=None,
+                 max_event_clients=None):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers or configured_server_option('max_workers', DEFAULT_MAX_WORKERS)
+        self.max_event_clients = max_event_clients or configured_server_option('max_event_clients',
+                                                                               DEFAULT_MAX_EVENT_CLIENTS)
+        self.shutdown_timeout = (shutdown_timeout if shutdown_timeout is not None
+                                 else configured_server_option('shutdown_timeout', SHUTDOWN_TIMEOUT))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='http')
+        self.events_executor = ThreadPoolExecutor(max_workers=self.max_event_clients, thread_name_prefix='sse')
+        self.draining = False
+        # EventBroadcaster de /api/events (solo en modo watch)
+        self.events = None
+        self._pending = set()
+        self._active = set()
+        self._lock = threading.Lock()
+        
+        # Conexiones keep-alive inactivas: {socket: (handler, vencimiento)}
+        self._selector = selectors.DefaultSelector()
+        self._idle = {}
+        self._to_park = deque()
+        self._closing = False
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._idle_thread = threading.Thread(target=self._watch_idle, name='http-idle', daemon=True)
+        self._idle_thread.start()
+    
+    def _submit(self, executor, fn, *args):
+        future = executor.submit(fn, *args)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+    
+    def process_request(self, request, client_address):
+        """Atiende la conexión en un hilo del pool"""
+        self._submit(self.executor, self.process_request_thread, request, client_address)
+    
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+    
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+    
+    def process_request_thread(self, request, client_address):
+        self._run_handler(request, client_address,
+                          lambda: self.finish_request(request, client_address))
+    
+    def resume_request_thread(self, handler):
+        """Atiende la siguiente petición de una conexión keep-alive que estaba inactiva"""
+        self._run_handler(handler.request, handler.client_address, handler.resume)
+    
+    def _run_handler(self, request, client_address, run):
+        handler = None
+        with self._lock:
+            self._active.add(request)
+        try:
+            handler = run()
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._lock:
+                self._active.discard(request)
+        
+        if handler is not None and handler.parked:
+            self.park(handler)
+        elif handler is not None and handler.continuation:
+            try:
+                self._submit(self.events_executor, self._run_continuation, handler)
+            except RuntimeError:
+                # Executor cerrado: el servidor se está deteniendo
+                self.close_handler(handler)
+        else:
+            self.shutdown_request(request)
+    
+    def _run_continuation(self, handler):
+        """Respuesta larga (SSE) en events_executor; luego cierra la conexión"""
+        with self._lock:
+            self._active.add(handler.request)
+        try:
+            handler.continuation()
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+        finally:
+            with self._lock:
+                self._active.discard(handler.request)
+            self.close_handler(handler)
+    
+    def close_handler(self, handler):
+        """Cierra una conexión que el handler dejó abierta (inactiva o SSE)"""
+        handler.parked = False
+        handler.continuation = None
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+    
+    def park(self, handler):
+        """Deja una conexión keep-alive inactiva en el selector, sin ocupar un hilo"""
+        self._to_park.append(handler)
+        self._wakeup()
+    
+    def _wakeup(self):
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            pass
+    
+    def _watch_idle(self):
+        """Hilo del selector: devuelve al pool las conexiones con datos y
+        cierra las que vencieron (o todas al detener el servidor)"""
+        while not self._closing:
+            for key, _ in self._selector.select(timeout=1):
+                if key.fileobj is self._wakeup_recv:
+                    try:
+                        while self._wakeup_recv.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                handler, _ = self._idle.pop(key.fileobj)
+                self._selector.unregister(key.fileobj)
+                try:
+                    self._submit(self.executor, self.resume_request_thread, handler)
+                except RuntimeError:
+                    self.close_handler(handler)
+            
+            while self._to_park:
+                handler = self._to_park.popleft()
+                self._idle[handler.request] = (handler, time.monotonic() + handler.timeout)
+                self._selector.register(handler.request, selectors.EVENT_READ)
+            
+            now = time.monotonic()
+            expired = [sock for sock, (_, deadline) in self._idle.items()
+                       if self.draining or self._closing or deadline <= now]
+            for sock in expired:
+                handler, _ = self._idle.pop(sock)
+                self._selector.unregister(sock)
+                self.close_handler(handler)
+    
+    def drain(self):
+        """Espera las conexiones en curso; devuelve cuántas quedaron sin terminar"""
+        self.draining = True
+        if self.events:
+            self.events.close()
+        # El selector cierra las conexiones keep-alive inactivas
+        self._wakeup()
+        with self._lock:
+            pending = set(self._pending)
+            # Las conexiones keep-alive inactivas leen EOF y se cierran; las
+            # que están respondiendo terminan su respuesta
+            for request in self._active:
+                try:
+                    request.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+        _, not_done = wait(pending, timeout=self.shutdown_timeout)
+        return len(not_done)
+    
+    def server_close(self):
+        super().server_close()
+        self._closing = True
+        self._wakeup()
+        self._idle_thread.join(timeout=2)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.events_executor.shutdown(wait=False, cancel_futures=True)
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+def entity_tag(stat, encoding=None):
+    """ETag de un archivo (mtime y tamaño) y, si la hay, de su codificación"""
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
 class ChatGPTHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Handler HTTP personalizado para ChatGPT Analytics Pro"""
     
+    # HTTP/1.1: la conexión se reutiliza entre peticiones (keep-alive)
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    
+    # ZIP del export del que se sirven los archivos que no estén en disco
+    export_zip = None
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=os.getcwd(), **kwargs)
     
     def end_headers(self):
-        """Agregar headers para evitar problemas de CORS"""
+        """Agregar headers para evitar problemas de CORS
+        
+        no-cache obliga al navegador a revalidar; con ETag/Last-Modified la
+        revalidación es un 304 sin cuerpo.
+        """
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.send_header('Cache-Control', 'no-cache')
         super().end_headers()
     
+    # True si la conexión quedó inactiva y debe esperar en el selector
+    parked = False
+    # Función que sigue atendiendo la conexión fuera del pool (SSE)
+    continuation = None
+    
+    def handle(self):
+        """Atiende las peticiones que ya llegaron y deja la conexión en espera
+        
+        En vez de bloquear un hilo del pool esperando la siguiente petición
+        de una conexión keep-alive, la marca como parked para que el servidor
+        la vigile con el selector (ver ChatGPTHTTPServer.park).
+        """
+        self.parked = False
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and not self.continuation:
+            if not self.input_pending() and hasattr(self.server, 'park'):
+                self.parked = True
+                return
+            self.handle_one_request()
+    
+    def resume(self):
+        """Continúa una conexión keep-alive cuando vuelve a tener datos"""
+        try:
+            self.handle()
+        finally:
+            self.finish()
+        return self
+    
+    def finish(self):
+        # Una conexión en espera o en SSE sigue abierta
+        if not self.parked and not self.continuation:
+            super().finish()
+    
+    def input_pending(self):
+        """True si ya hay datos de otra petición (sin bloquear)"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return True
+        finally:
+            self.connection.settimeout(self.timeout)
+    
+    def handle_one_request(self):
+        """Atiende una petición; al detener el servidor cierra la conexión"""
+        super().handle_one_request()
+        if getattr(self.server, 'draining', False):
+            self.close_connection = True
+    
     def do_GET(self):
         """Manejar requests GET"""
         # Redirigir a advanced_report.html por defecto
         if self.path == '/' or self.path == '/index.html':
             self.path = '/advanced_report.html'
+        if urllib.parse.urlsplit(self.path).path == '/api/events':
+            return self.stream_events()
         return super().do_GET()
     
+    def send_head(self):
+        """Sirve variantes precomprimidas, archivos con validadores y, desde
+        el ZIP del export, los archivos que no existen en disco"""
+        route = urllib.parse.urlsplit(self.path).path
+        if route.startswith('/api/'):
+            return self.send_api(route)
+        
+        path = self.translate_path(self.path)
+        if not os.path.isdir(path):
+            f = self.send_compressed_variant(path)
+            if f is not None:
+                return f
+            if os.path.isfile(path):
+                return self.send_file(path)
+        if self.export_zip and not os.path.exists(path):
+            f = self.send_zip_member()
+            if f is not None:
+                return f
+        return super().send_head()
+    
+    def is_not_modified(self, etag, mtime=None):
+        """Evalúa If-None-Match / If-Modified-Since contra la representación"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            if since is not None and since.tzinfo is not None:
+                return int(mtime) <= since.timestamp()
+        return False
+    
+    def send_validators(self, etag, mtime=None):
+        self.send_header("ETag", etag)
+        if mtime is not None:
+            self.send_header("Last-Modified", self.date_time_string(mtime))
+    
+    def send_not_modified(self, etag, mtime=None, vary=False):
+        """Responde 304 y devuelve un cuerpo vacío"""
+        self.send_response(304)
+        self.send_validators(etag, mtime)
+        if vary:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return io.BytesIO()
+    
+    def send_file(self, path):
+        """Envía un archivo con ETag/Last-Modified y, si conviene, comprimido
+        
+        Las variantes gzip/brotli se guardan en memoria hasta que cambie el
+        archivo. Devuelve el stream del cuerpo (vacío si fue un 304).
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        
+        content_type = self.guess_type(path)
+        compressible = is_compressible(content_type, stat.st_size)
+        encoding = choose_encoding(self.headers.get('Accept-Encoding')) if compressible else None
+        etag = entity_tag(stat, encoding)
+        
+        if self.is_not_modified(etag, stat.st_mtime):
+            return self.send_not_modified(etag, stat.st_mtime, vary=compressible)
+        
+        if encoding:
+            body = get_asset_cache().get(path, encoding, stat)
+            f = io.BytesIO(body)
+            length = len(body)
+        else:
+            f = open(path, 'rb')
+            length = stat.st_size
+        
+        self.send_response(200)
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(length))
+        self.send_validators(etag, stat.st_mtime)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return f
+    
+    def send_compressed_variant(self, path):
+        """Envía path.gz/path.zst con Content-Encoding si el cliente lo acepta
+        
+        Si solo existe la variante comprimida y el cliente no la acepta, se
+        descomprime al vuelo.
+        """
+        variant = find_precompressed(path, self.headers.get('Accept-Encoding'))
+        if variant is not None:
+            variant_path, encoding = variant
+            stat = os.stat(variant_path)
+            etag = entity_tag(stat, encoding)
+            if self.is_not_modified(etag, stat.st_mtime):
+                return self.send_not_modified(etag, stat.st_mtime, vary=True)
+            
+            f = open(variant_path, 'rb')
+            self.send_response(200)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(stat.st_size))
+            self.send_validators(etag, stat.st_mtime)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return f
+        
+        if os.path.exists(path) or not any(p.exists() for p in stats_variants(path)):
+            return None
+        f = open_decompressed(path)
+        if f is None:
+            return None
+        self.send_response(200)
+        self.send_header("Content-type", self.guess_type(path))
+        self.send_header("Vary", "Accept-Encoding")
+        # Sin Content-Length el fin de la respuesta lo marca el cierre
+        self.send_header("Connection", "close")
+        self.end_headers()
+        return f
+    
+    def send_zip_member(self):
+        """Envía los headers de un miembro del ZIP y devuelve su stream"""
+        rel_path = self.path.split('?', 1)[0].split('#', 1)[0]
+        rel_path = urllib.parse.unquote(rel_path)
+        
+        zf = zipfile.ZipFile(self.export_zip)
+        info = find_member(zf, rel_path)
+        if info is None:
+            zf.close()
+            return None
+        
+        # El CRC identifica el contenido del miembro
+        etag = f'"{info.CRC:08x}-{info.file_size:x}"'
+        if self.is_not_modified(etag):
+            zf.close()
+            return self.send_not_modified(etag)
+        
+        # El stream del miembro mantiene el ZIP abierto hasta que se cierre
+        f = zf.open(info)
+        zf.close()
+        
+        self.send_response(200)
+        self.send_header("Content-type", self.guess_type(info.filename))
+        self.send_header("Content-Length", str(info.file_size))
+        self.send_validators(etag)
+        self.end_headers()
+        return f
+    
+    def send_api(self, route):
+        """Rutas JSON de la API; devuelve el stream del cuerpo"""
+        prefix = '/api/conversations/'
+        if route.startswith(prefix) and len(route) > len(prefix):
+            return self.send_conversation(urllib.parse.unquote(route[len(prefix):]))
+        if route.startswith('/api/items/'):
+            return self.send_items(route[len('/api/items/'):])
+        if route == '/api/search':
+            return self.send_search()
+        return self.send_json_error(404, "Ruta de API desconocida")
+    
+    def send_conversation(self, conv_id):
+        """Una conversación leída del export con el índice de offsets
+        
+        conv_id 'random' elige una al azar. Solo se lee el rango de bytes de
+        esa conversación, no el conversations.json completo.
+        """
+        try:
+            index = open_index(os.path.join(self.directory, INDEX_NAME))
+        except (OSError, ValueError, KeyError) as e:
+            return self.send_json_error(503, f"Índice de conversaciones inválido: {e}")
+        if index is None:
+            return self.send_json_error(404, "Sin índice de conversaciones: ejecuta primero el parser")
+        if index.is_stale():
+            return self.send_json_error(503, "El export cambió desde el último análisis: vuelve a ejecutar el parser")
+        
+        if conv_id == 'random':
+            position = index.random_position()
+            etag = None
+        else:
+            position = index.positions.get(conv_id)
+            etag = f'W/"{index.source_mtime_ns:x}-{position:x}"' if position is not None else None
+        if position is None:
+            return self.send_json_error(404, "Conversación no encontrada")
+        
+        if etag and self.is_not_modified(etag):
+            return self.send_not_modified(etag, vary=True)
+        return self.send_json(index.read(position), etag=etag)
+    
+    def send_items(self, collection):
+        """Página de una lista por conversación (títulos, complejidad, rachas)
+        
+        ?page=&per_page=&sort=&order=asc|desc&q=&min_<col>=&max_<col>=&<col>=
+        """
+        path = os.path.join(self.directory, ITEMS_NAME)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self.send_json_error(404, "Sin listas por conversación: ejecuta primero el parser")
+        
+        # La misma URL con el mismo almacén produce siempre la misma página
+        # (débil: vale tanto para la respuesta comprimida como sin comprimir)
+        etag = f'W/{entity_tag(stat)}'
+        if self.is_not_modified(etag, stat.st_mtime):
+            return self.send_not_modified(etag, stat.st_mtime, vary=True)
+        
+        query = urllib.parse.urlsplit(self.path).query
+        params = dict(urllib.parse.parse_qsl(query))
+        try:
+            page = query_items(path, collection, params)
+        except KeyError:
+            return self.send_json_error(404, f"Colección desconocida: {collection}")
+        except ItemQueryError as e:
+            return self.send_json_error(400, str(e))
+        
+        body = json.dumps(page, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return self.send_json(body, etag=etag)
+    
+    def send_search(self):
+        """Búsqueda de texto completo: ?q=palabras&page=&per_page=&role="""
+        path = os.path.join(self.directory, SEARCH_NAME)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self.send_json_error(404, "Sin índice de búsqueda: ejecuta el parser con --search-index")
+        
+        etag = f'W/{entity_tag(stat)}'
+        if self.is_not_modified(etag, stat.st_mtime):
+            return self.send_not_modified(etag, stat.st_mtime, vary=True)
+        
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        try:
+            page = int(params.get('page') or 1)
+            per_page = int(params.get('per_page') or 0) or None
+        except ValueError:
+            return self.send_json_error(400, "page y per_page deben ser enteros")
+        
+        options = {'per_page': per_page} if per_page else {}
+        results = search(path, params.get('q', ''), page=page, role=params.get('role') or None, **options)
+        body = json.dumps(results, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return self.send_json(body, etag=etag)
+    
+    def stream_events(self):
+        """Server-Sent Events del modo watch ('stats-updated', etc.)
+        
+        La conexión queda abierta enviando los eventos a medida que llegan
+        y un comentario cada EVENTS_HEARTBEAT segundos. El envío sigue en
+        events_executor para no retener un hilo del pool de peticiones.
+        """
+        events = getattr(self.server, 'events', None)
+        if events is None:
+            f = self.send_json_error(404, "Eventos no disponibles: inicia el servidor con --watch")
+        elif not events.acquire():
+            f = self.send_json_error(503, "Demasiados clientes de eventos conectados")
+        else:
+            f = None
+        if f is not None:
+            self.copyfile(f, self.wfile)
+            return
+        
+        try:
+            last_id = int(self.headers.get('Last-Event-ID'))
+        except (TypeError, ValueError):
+            last_id = events.last_id
+        
+        self.send_response(200)
+        self.send_header("Content-type", "text/event-stream; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        if hasattr(self.server, 'events_executor'):
+            self.continuation = lambda: self.send_events(events, last_id)
+        else:
+            self.send_events(events, last_id)
+    
+    def send_events(self, events, last_id):
+        """Envía los eventos posteriores a last_id hasta que se cierre la conexión"""
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            
+            while not events.closed and not self.server.draining:
+                pending = events.wait(last_id, EVENTS_HEARTBEAT)
+                if not pending:
+                    self.wfile.write(b": ping\n\n")
+                for event_id, name, data in pending:
+                    self.wfile.write(f"id: {event_id}\nevent: {name}\ndata: {data}\n\n".encode('utf-8'))
+                    last_id = event_id
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+        finally:
+            events.release()
+    
+    def send_json(self, body, status=200, etag=None):
+        """Envía un cuerpo JSON (bytes), comprimido si el cliente lo acepta"""
+        encoding = None
+        if len(body) >= MIN_COMPRESS_SIZE:
+            encoding = choose_encoding(self.headers.get('Accept-Encoding'))
+            if encoding:
+                body = compress(body, encoding)
+        
+        self.send_response(status)
+        self.send_header("Content-type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_validators(etag)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return io.BytesIO(body)
+    
+    def send_json_error(self, status, message):
+        return self.send_json(json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'), status)
+    
     def log_message(self, format, *args):
         """Personalizar logs del servidor"""
         # Solo mostrar logs importantes
-        if any(keyword in args[0] for keyword in ['.html', '.json', '.css', '.js']):
+        if any(keyword in str(args[0]) for keyword in ['.html', '.json', '.css', '.js', '/api/']):
             super().log_message(format, *args)
 
 class ChatGPTServer:
     """Servidor web para ChatGPT Analytics Pro"""
     
-    def __init__(self, port=8001, auto_open=True):
+    def __init__(self, port=8001, auto_open=True, export_zip=None, max_workers=None, watch=False,
+                 watch_roles=None):
         self.port = port
         self.auto_open = auto_open
+        self.export_zip = export_zip
+        self.max_workers = max_workers
+        # Modo watch: re-analiza al cambiar el export y avisa por /api/events
+        self.watch = watch
+        self.watch_roles = watch_roles
+        self.watcher = None
         self.server = None
     
     def find_available_port(self):
@@ -75,7 +742,11 @@ class ChatGPTServer:
             self.port = self.find_available_port()
             
             # Crear servidor
-            self.server = socketserver.TCPServer(("", self.port), ChatGPTHTTPRequestHandler)
+            ChatGPTHTTPRequestHandler.export_zip = self.export_zip
+            self.server = ChatGPTHTTPServer(("", self.port), ChatGPTHTTPRequestHandler,
+                                            max_workers=self.max_workers)
+            if self.watch:
+                self.server.events = EventBroadcaster(self.server.max_event_clients)
             
             print("=" * 80)
             print("🚀 ChatGPT Analytics Pro - Servidor Web")
@@ -83,16 +754,25 @@ class ChatGPTServer:
             print(f"🌐 Servidor iniciado en: http://localhost:{self.port}")
             print(f"📊 Reporte avanzado: http://localhost:{self.port}/advanced_report.html")
             print(f"📈 Reporte básico: http://localhost:{self.port}/report.html")
+            print(f"🧵 Hilos de atención: {self.server.max_workers}")
             print("=" * 80)
             print("Presiona Ctrl+C para detener el servidor")
             print("=" * 80)
             
+            if self.watch:
+                from watcher import ExportWatcher
+                self.watcher = ExportWatcher(os.getcwd(), on_event=self.on_watch_event, roles=self.watch_roles)
+                self.watcher.start()
+            
             # Abrir navegador en un hilo separado
             if self.auto_open:
                 browser_thread = threading.Thread(target=self.open_browser)
                 browser_thread.daemon = True
                 browser_thread.start()
             
+            # SIGTERM detiene el servidor igual que Ctrl+C
+            install_sigterm_handler()
+            
             # Iniciar servidor
             self.server.serve_forever()
             
@@ -102,13 +782,37 @@ class ChatGPTServer:
             print(f"❌ Error iniciando servidor: {e}")
             sys.exit(1)
     
+    def on_watch_event(self, event, data):
+        """Reenvía un evento del watcher a los reportes abiertos"""
+        if event == 'stats-updated' and data.get('zip'):
+            # Los audios y archivos se sirven desde el ZIP recién analizado
+            ChatGPTHTTPRequestHandler.export_zip = data['zip']
+        self.server.events.publish(event, data)
+    
     def stop(self):
-        """Detiene el servidor"""
+        """Detiene el servidor esperando las peticiones en curso"""
+        if self.watcher:
+            self.watcher.stop()
         if self.server:
-            self.server.shutdown()
-            self.server.server_close()
+            stop_server(self.server)
         print("\n🛑 Servidor detenido")
 
+def install_sigterm_handler():
+    """Convierte SIGTERM en KeyboardInterrupt para un apagado ordenado"""
+    def handler(signum, frame):
+        raise KeyboardInterrupt
+    
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, handler)
+
+def stop_server(server):
+    """Deja de aceptar conexiones, espera las activas y libera el puerto"""
+    server.shutdown()
+    unfinished = server.drain()
+    if unfinished:
+        print(f"⚠️  {unfinished} conexiones no terminaron a tiempo")
+    server.server_close()
+
 def main():
     """Función principal"""
     import argparse
@@ -116,6 +820,13 @@ def main():
     parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Servidor Web")
     parser.add_argument("--port", type=int, default=8001, help="Puerto del servidor")
     parser.add_argument("--no-browser", action="store_true", help="No abrir navegador automáticamente")
+    parser.add_argument("--zip", dest="zip_path", help="ZIP del export del que servir audios y archivos sin extraerlo")
+    parser.add_argument("--workers", type=int,
+                        help=f"Máximo de conexiones atendidas a la vez (por defecto {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--watch", action="store_true",
+                        help="Re-analizar al cambiar conversations.json o el ZIP y actualizar los reportes abiertos")
+    parser.add_argument("--roles", nargs="+", default=['user'],
+                        help="Roles de autor que re-analiza --watch (por defecto user, como setup.py y parser.py)")
     
     args = parser.parse_args()
     
@@ -129,7 +840,8 @@ def main():
         sys.exit(1)
     
     # Crear y iniciar servidor
-    server = ChatGPTServer(port=args.port, auto_open=not args.no_browser)
+    server = ChatGPTServer(port=args.port, auto_open=not args.no_browser, export_zip=args.zip_path,
+                           max_workers=args.workers, watch=args.watch, watch_roles=tuple(args.roles))
     server.start()
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Carga de la configuración (config.py)
+config.py es opcional: cada sección se combina con los valores por defecto
+de este módulo (los mismos de config.example.py), así que basta con definir
+las claves que se quieran cambiar. Los valores inválidos se avisan y se
+reemplazan por el valor por defecto.
+"""
+
+import copy
+import importlib
+
+DEFAULTS = {
+    'SERVER_CONFIG': {
+        'port': 8001,
+        'auto_open_browser': True,
+        'host': 'localhost',
+        'max_workers': 16,
+        'max_event_clients': 32,
+        'shutdown_timeout': 10
+    },
+    'ANALYSIS_CONFIG': {
+        'enable_sentiment_analysis': True,
+        'sentiment_backend': 'textblob',
+        'enable_advanced_analysis': True,
+        'enable_audio_analysis': True,
+        'build_search_index': False,
+        'top_k_mode': 'exact',
+        'top_k_capacity': 10000,
+        'max_conversations': None,
+        'chunk_size': 1000
+    },
+    'VISUALIZATION_CONFIG': {
+        'chart_animation_duration': 1000,
+        'particle_count': 80,
+        'background_effects': True,
+        'neon_intensity': 1.0,
+        'glitch_effects': True
+    },
+    'FILE_CONFIG': {
+        'data_dir': '.',
+        'output_file': 'chatgpt_stats.json',
+        'backup_stats': True,
+        'compress_output': False
+    },
+    'LOGGING_CONFIG': {
+        'level': 'INFO',
+        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        'file': 'chatgpt_analytics.log'
+    },
+    'TERMS_CONFIG': {
+        'technical_terms': None,
+        'programming_languages': None,
+        'interaction_patterns': None,
+        'topics': None
+    }
+}
+
+# Claves que deben ser enteros >= 1: (sección, clave) -> si admiten None
+_POSITIVE_INTS = {
+    ('ANALYSIS_CONFIG', 'chunk_size'): False,
+    ('ANALYSIS_CONFIG', 'max_conversations'): True,
+    ('ANALYSIS_CONFIG', 'top_k_capacity'): False,
+    ('SERVER_CONFIG', 'max_event_clients'): False,
+    ('SERVER_CONFIG', 'max_workers'): False,
+}
+
+_config = None
+
+
+def _valid(section, key, value):
+    allows_none = _POSITIVE_INTS.get((section, key))
+    if allows_none is None:
+        return True
+    if value is None:
+        return allows_none
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def load_config(module_name='config', reload=False):
+    """Configuración completa: {sección: dict} con los valores por defecto
+
+    Se lee una sola vez; reload=True vuelve a importar config.py.
+    """
+    global _config
+    if _config is not None and not reload:
+        return _config
+
+    try:
+        module = importlib.import_module(module_name)
+        if reload:
+            module = importlib.reload(module)
+    except ModuleNotFoundError as e:
+        # Sin config.py se usan los valores por defecto; un import que falla
+        # dentro de config.py sí es un error
+        if e.name != module_name:
+            raise
+        module = None
+
+    config = copy.deepcopy(DEFAULTS)
+    for section, values in config.items():
+        overrides = getattr(module, section, None) or {}
+        for key, value in overrides.items():
+            if _valid(section, key, value):
+                values[key] = value
+            else:
+                print(f"⚠️  {section}['{key}'] = {value!r} no es válido. Se usará {values.get(key)!r}.")
+    _config = config
+    return config
+
+
+def config_section(section):
+    """Una sección de la configuración (p. ej. 'ANALYSIS_CONFIG')"""
+    return load_config()[section]
+
+
+def config_value(section, key, default=None):
+    """Valor de section[key] (o default si no existe)"""
+    return config_section(section).get(key, default)
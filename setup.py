@@ -6,7 +6,6 @@ Configuración automática para cualquier usuario
 
 import os
 import sys
-import json
 import zipfile
 import shutil
 import subprocess
@@ -112,6 +111,34 @@ def extract_chatgpt_data(zip_path):
         print(f"❌ Error extrayendo datos: {e}")
         return False
 
+def verify_export_zip(zip_path):
+    """Verifica que el ZIP contenga los archivos necesarios (sin extraerlo)"""
+    from export_archive import find_member
+    
+    required_files = ["conversations.json"]
+    optional_files = ["user.json", "message_feedback.json"]
+    
+    print(f"\n🔍 Verificando contenido de {zip_path.name}...")
+    
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            missing_required = [f for f in required_files if find_member(zip_ref, f) is None]
+            missing_optional = [f for f in optional_files if find_member(zip_ref, f) is None]
+    except zipfile.BadZipFile as e:
+        print(f"❌ ZIP inválido: {e}")
+        return False
+    
+    if missing_required:
+        print(f"❌ Archivos requeridos faltantes: {', '.join(missing_required)}")
+        return False
+    
+    print("✅ Archivos requeridos encontrados")
+    
+    if missing_optional:
+        print(f"⚠️  Archivos opcionales faltantes: {', '.join(missing_optional)}")
+    
+    return True
+
 def verify_extracted_data():
     """Verifica que los datos se hayan extraído correctamente"""
     required_files = ["conversations.json"]
@@ -140,8 +167,11 @@ def verify_extracted_data():
     
     return True
 
-def process_data():
-    """Procesa los datos y genera estadísticas"""
+def process_data(source="conversations.json"):
+    """Procesa los datos y genera estadísticas
+    
+    source puede ser conversations.json o directamente el ZIP del export.
+    """
     print("\n⚙️  Procesando datos de ChatGPT...")
     
     try:
@@ -149,11 +179,15 @@ def process_data():
         from parser import parse_conversations
         
         # Procesar conversaciones
-        stats = parse_conversations("conversations.json")
+        from conversation_index import INDEX_NAME
+        from search_index import SEARCH_NAME, configured_search_index
+        stats = parse_conversations(str(source), stream=True, index_path=INDEX_NAME,
+                                    search_path=SEARCH_NAME if configured_search_index() else None)
         
         # Guardar estadísticas
-        with open("chatgpt_stats.json", "w", encoding="utf-8") as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2, default=str)
+        from item_store import save_items
+        from stats_writer import configured_compression, write_stats
+        write_stats(save_items(stats, "chatgpt_stats.json"), "chatgpt_stats.json", configured_compression())
         
         print("✅ Datos procesados correctamente")
         print(f"📊 Estadísticas generadas: {stats['total_conversations']} conversaciones")
@@ -163,11 +197,23 @@ def process_data():
         print(f"❌ Error procesando datos: {e}")
         return False
 
-def start_server():
-    """Inicia el servidor web"""
+def start_server(zip_path=None, watch=False):
+    """Inicia el servidor web
+    
+    Si se indica el ZIP del export, los audios y demás archivos se sirven
+    directamente desde él cuando el reporte los pide. Con watch=True se
+    re-analiza al cambiar el export y los reportes abiertos se actualizan.
+    """
     print("\n🌐 Iniciando servidor web...")
     
     try:
+        if zip_path or watch:
+            from server import ChatGPTServer
+            # Mismos roles que process_data (parser.py analiza solo al usuario)
+            ChatGPTServer(export_zip=str(zip_path) if zip_path else None, watch=watch,
+                          watch_roles=('user',)).start()
+            return
+        
         # Importar y ejecutar el servidor
         from simple_server import start_server as server_start
         server_start()
@@ -178,6 +224,15 @@ def start_server():
 
 def main():
     """Función principal del setup"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Setup")
+    parser.add_argument("--extract", action="store_true",
+                        help="Extraer el ZIP completo a disco en lugar de leerlo directamente")
+    parser.add_argument("--watch", action="store_true",
+                        help="Re-analizar al cambiar el export y actualizar el reporte abierto")
+    args = parser.parse_args()
+    
     print_banner()
     
     # Verificar Python
@@ -194,18 +249,30 @@ def main():
         print("\n❌ Setup falló: No se encontró archivo ZIP")
         sys.exit(1)
     
-    # Extraer datos
-    if not extract_chatgpt_data(zip_path):
-        print("\n❌ Setup falló en la extracción de datos")
-        sys.exit(1)
-    
-    # Verificar datos
-    if not verify_extracted_data():
-        print("\n❌ Setup falló en la verificación de datos")
-        sys.exit(1)
+    if args.extract:
+        # Extraer datos
+        if not extract_chatgpt_data(zip_path):
+            print("\n❌ Setup falló en la extracción de datos")
+            sys.exit(1)
+        
+        # Verificar datos
+        if not verify_extracted_data():
+            print("\n❌ Setup falló en la verificación de datos")
+            sys.exit(1)
+        
+        source = Path("conversations.json")
+        served_zip = None
+    else:
+        # Verificar el ZIP sin extraerlo
+        if not verify_export_zip(zip_path):
+            print("\n❌ Setup falló en la verificación de datos")
+            sys.exit(1)
+        
+        source = zip_path
+        served_zip = zip_path
     
     # Procesar datos
-    if not process_data():
+    if not process_data(source):
         print("\n❌ Setup falló en el procesamiento de datos")
         sys.exit(1)
     
@@ -218,7 +285,7 @@ def main():
     print("=" * 80)
     
     # Iniciar servidor
-    start_server()
+    start_server(served_zip, watch=args.watch)
 
 if __name__ == "__main__":
     main()
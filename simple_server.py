@@ -4,35 +4,28 @@ Servidor HTTP simple para servir el reporte avanzado
 """
 
 import http.server
-import socketserver
 import webbrowser
 import os
 import sys
 import threading
 import time
 
-PORT = 8001
+from server import ChatGPTHTTPRequestHandler, ChatGPTHTTPServer, install_sigterm_handler, stop_server
 
-class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def end_headers(self):
-        # Agregar headers para evitar problemas de CORS
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-cache')
-        super().end_headers()
+PORT = 8001
 
-    def do_GET(self):
-        # Redirigir a advanced_report.html por defecto
-        if self.path == '/' or self.path == '/index.html':
-            self.path = '/advanced_report.html'
-        return super().do_GET()
+class MyHTTPRequestHandler(ChatGPTHTTPRequestHandler):
+    """Mismo handler que server.py (CORS, keep-alive, ETags, compresión)
+    pero registrando todas las peticiones"""
+    
+    def log_message(self, format, *args):
+        http.server.SimpleHTTPRequestHandler.log_message(self, format, *args)
 
 def start_server():
     """Inicia el servidor HTTP"""
     global PORT
     try:
-        with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+        with ChatGPTHTTPServer(("", PORT), MyHTTPRequestHandler) as httpd:
             print(f"🚀 Servidor avanzado iniciado en http://localhost:{PORT}")
             print(f"📊 Reporte disponible en: http://localhost:{PORT}/advanced_report.html")
             print(f"📈 Reporte básico disponible en: http://localhost:{PORT}/report.html")
@@ -48,7 +41,12 @@ def start_server():
             browser_thread.daemon = True
             browser_thread.start()
             
-            httpd.serve_forever()
+            install_sigterm_handler()
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                stop_server(httpd)
+                raise
             
     except KeyboardInterrupt:
         print("\n🛑 Servidor detenido")
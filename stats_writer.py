@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Escritura de chatgpt_stats.json
+Serializa las estadísticas en streaming con codificación compacta y,
+opcionalmente, comprimidas con gzip o zstd (FILE_CONFIG['compress_output'])
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+from settings import config_value
+
+# Formato -> (extensión, Content-Encoding HTTP)
+COMPRESSION_FORMATS = {
+    'gzip': ('.gz', 'gzip'),
+    'zstd': ('.zst', 'zstd'),
+}
+
+# Caracteres acumulados antes de cada escritura
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _load_zstd():
+    """Módulo zstandard, o None si no está instalado"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def configured_compression():
+    """Compresión elegida en FILE_CONFIG['compress_output'] (config.py)
+
+    Acepta False/None (sin comprimir), True (gzip), 'gzip' o 'zstd'.
+    """
+    return normalize_compression(config_value('FILE_CONFIG', 'compress_output', False))
+
+
+def normalize_compression(value):
+    """Convierte el valor de configuración/CLI a 'gzip', 'zstd' o None"""
+    if value is True:
+        return 'gzip'
+    if not value or value == 'none':
+        return None
+    if value not in COMPRESSION_FORMATS:
+        print(f"⚠️  Compresión '{value}' no soportada. Se usará gzip.")
+        return 'gzip'
+    if value == 'zstd' and _load_zstd() is None:
+        print("⚠️  zstandard no instalado. Se usará gzip.")
+        return 'gzip'
+    return value
+
+
+def compressed_path(path, compression):
+    """Ruta del archivo comprimido (p. ej. chatgpt_stats.json.gz)"""
+    path = Path(path)
+    if not compression:
+        return path
+    return path.with_name(path.name + COMPRESSION_FORMATS[compression][0])
+
+
+def _open_binary(path, compression, name):
+    """Abre el destino en modo binario con el compresor pedido"""
+    raw = open(path, 'wb')
+    if compression == 'gzip':
+        # name va en la cabecera gzip (sin el sufijo .tmp del temporal)
+        return gzip.GzipFile(filename=name, fileobj=raw, mode='wb', compresslevel=6, mtime=0), raw
+    if compression == 'zstd':
+        return _load_zstd().ZstdCompressor(level=10).stream_writer(raw, closefd=False), raw
+    return raw, None
+
+
+def write_stats(stats, path, compression=None, indent=None):
+    """Escribe las estadísticas en JSON sin construir el texto completo en memoria
+
+    La salida es compacta salvo que se pida indent. Con compresión el archivo
+    lleva la extensión correspondiente y se eliminan las otras variantes del
+    mismo archivo para que el servidor no sirva datos viejos. La escritura es
+    atómica: se genera un temporal y se renombra al terminar.
+    Devuelve la ruta escrita.
+    """
+    compression = normalize_compression(compression)
+    target = compressed_path(path, compression)
+    tmp_path = target.with_name(target.name + '.tmp')
+
+    separators = (',', ': ') if indent is not None else (',', ':')
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent, separators=separators, default=str)
+
+    stream, raw = _open_binary(tmp_path, compression, target.name)
+    try:
+        with stream:
+            # Juntar los fragmentos pequeños de iterencode antes de comprimir
+            pending = []
+            pending_size = 0
+            for chunk in encoder.iterencode(stats):
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= WRITE_BUFFER_SIZE:
+                    stream.write(''.join(pending).encode('utf-8'))
+                    pending = []
+                    pending_size = 0
+            stream.write(''.join(pending).encode('utf-8'))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if raw is not None:
+            raw.close()
+    os.replace(tmp_path, target)
+
+    for variant in stats_variants(path):
+        if variant != target and variant.exists():
+            variant.unlink()
+
+    return target
+
+
+def stats_variants(path):
+    """Todas las variantes posibles (plana y comprimidas) de un archivo"""
+    path = Path(path)
+    return [path] + [compressed_path(path, compression) for compression in COMPRESSION_FORMATS]
+
+
+def find_precompressed(path, accept_encoding):
+    """Variante comprimida de path que el cliente acepta, o None
+
+    Devuelve (ruta, content_encoding). Solo se elige si no es más vieja que
+    el archivo plano (cuando existe).
+    """
+    accepted = {token.split(';', 1)[0].strip().lower() for token in (accept_encoding or '').split(',')}
+    path = Path(path)
+    plain_mtime = path.stat().st_mtime if path.exists() else None
+
+    # zstd primero: comprime mejor y los navegadores modernos lo aceptan
+    for compression in ('zstd', 'gzip'):
+        extension, encoding = COMPRESSION_FORMATS[compression]
+        candidate = compressed_path(path, compression)
+        if encoding in accepted and candidate.exists():
+            if plain_mtime is None or candidate.stat().st_mtime >= plain_mtime:
+                return candidate, encoding
+    return None
+
+
+def open_decompressed(path):
+    """Abre path (o su variante comprimida) devolviendo un stream binario plano
+
+    Para clientes que no aceptan la compresión del único archivo disponible.
+    """
+    path = Path(path)
+    if path.exists():
+        return open(path, 'rb')
+    gz_path = compressed_path(path, 'gzip')
+    if gz_path.exists():
+        return gzip.open(gz_path, 'rb')
+    zst_path = compressed_path(path, 'zstd')
+    zstandard = _load_zstd()
+    if zst_path.exists() and zstandard:
+        return zstandard.ZstdDecompressor().stream_reader(open(zst_path, 'rb'), closefd=True)
+    return None
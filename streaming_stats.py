@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Estadísticas en streaming de memoria constante
+Acumuladores que reciben un valor por mensaje sin guardarlos: media y
+varianza (Welford), mínimo/máximo, histograma de bins fijos, cuantiles
+aproximados, una serie acotada para gráficos y rankings top-k aproximados
+(Space-Saving). Todos se pueden fusionar (merge), así que sirven igual en
+los procesos hijos y en la caché incremental.
+"""
+
+import heapq
+import math
+from bisect import bisect_right
+
+from settings import config_value
+
+# Bins del histograma de longitud de mensajes (caracteres)
+LENGTH_BINS = (0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Bins del histograma de sentimiento (polaridad de -1 a 1)
+SENTIMENT_BINS = tuple(round(-1 + step / 10, 1) for step in range(21))
+
+# Bins del histograma de gaps entre conversaciones (horas)
+GAP_BINS = (0, 1, 6, 24, 72, 168, 720, 2160, 8760)
+
+# Puntos máximos de la serie de sentimiento del reporte
+SERIES_POINTS = 1000
+
+# Error relativo de los cuantiles
+QUANTILE_ACCURACY = 0.01
+
+PERCENTILES = (50, 90, 99)
+
+# Modos de los rankings (palabras, emojis, temas, términos técnicos)
+TOP_K_MODES = ('exact', 'approximate')
+
+# Claves que guarda cada ranking aproximado
+TOP_K_CAPACITY = 10_000
+
+
+class RunningStats:
+    """Conteo, media, varianza (Welford), mínimo y máximo"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Fusiona otro acumulador (fórmula de Chan para la varianza)"""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        """Desviación estándar muestral (0 con menos de dos valores)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
+
+    def to_dict(self):
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max}
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class Histogram:
+    """Conteos por bins fijos; edges son los bordes inferiores de cada bin"""
+
+    __slots__ = ('edges', 'counts')
+
+    def __init__(self, edges):
+        self.edges = tuple(edges)
+        self.counts = [0] * len(self.edges)
+
+    def add(self, value):
+        # Los valores menores al primer borde van al primer bin
+        self.counts[max(bisect_right(self.edges, value) - 1, 0)] += 1
+
+    def merge(self, other):
+        if other.edges != self.edges:
+            raise ValueError("No se pueden fusionar histogramas con bins distintos")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def to_dict(self):
+        return {'edges': list(self.edges), 'counts': list(self.counts)}
+
+    def __getstate__(self):
+        return self.edges, self.counts
+
+    def __setstate__(self, state):
+        self.edges, self.counts = state
+
+
+class QuantileSketch:
+    """Cuantiles aproximados con error relativo acotado (estilo DDSketch)
+
+    Cada valor positivo cae en el bucket ceil(log_gamma(valor)); el número
+    de buckets crece con el logaritmo del rango, no con la cantidad de
+    valores. El cuantil estimado está a lo sumo a relative_accuracy (en
+    proporción) del valor real.
+    """
+
+    def __init__(self, relative_accuracy=QUANTILE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("No se pueden fusionar sketches con distinta precisión")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        """Valor aproximado del cuantil q (0 a 1); None si no hay valores"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class Distribution:
+    """RunningStats + histograma y, opcionalmente, percentiles"""
+
+    def __init__(self, edges, quantiles=False):
+        self.stats = RunningStats()
+        self.histogram = Histogram(edges)
+        self.sketch = QuantileSketch() if quantiles else None
+
+    def add(self, value):
+        self.stats.add(value)
+        self.histogram.add(value)
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    def percentiles(self):
+        """{'p50': ..., 'p90': ..., 'p99': ...} (vacío sin sketch o sin datos)"""
+        if self.sketch is None or not self.sketch.count:
+            return {}
+        return {f"p{p}": round(self.sketch.quantile(p / 100), 2) for p in PERCENTILES}
+
+    def to_dict(self):
+        summary = self.stats.to_dict()
+        summary.update(self.percentiles())
+        summary['histogram'] = self.histogram.to_dict()
+        return summary
+
+
+class SequenceSeries:
+    """Serie en orden del export con a lo sumo max_points puntos
+
+    Cada valor llega con su posición (la fila de la conversación en la
+    tabla final) y cada punto es la media de un tramo de posiciones
+    [k * width, (k + 1) * width). Con más de max_points tramos el ancho se
+    duplica; como los tramos quedan alineados a múltiplos del ancho, fusionar
+    series da los mismos puntos sin importar cómo se repartieron.
+    """
+
+    def __init__(self, max_points=SERIES_POINTS):
+        self.max_points = max_points
+        self.width = 1
+        # Tramo -> [suma, cantidad]
+        self.buckets = {}
+
+    def add(self, total, position, count=1):
+        """Agrega count valores (que suman total) en position"""
+        key = position // self.width
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket[0] += total
+            bucket[1] += count
+            return
+        self.buckets[key] = [total, count]
+        if len(self.buckets) > self.max_points:
+            self._compact()
+
+    def _add_bucket(self, key, total, count):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = [total, count]
+        else:
+            bucket[0] += total
+            bucket[1] += count
+
+    def _rebin(self, width):
+        buckets, self.buckets = self.buckets, {}
+        factor = width // self.width
+        self.width = width
+        for key, (total, count) in buckets.items():
+            self._add_bucket(key // factor, total, count)
+
+    def _compact(self):
+        while len(self.buckets) > self.max_points:
+            self._rebin(self.width * 2)
+
+    def merge(self, other):
+        """Suma los tramos de otra serie (llevados al mayor de los dos anchos)"""
+        if other.width > self.width:
+            self._rebin(other.width)
+        factor = self.width // other.width
+        for key, (total, count) in other.buckets.items():
+            self._add_bucket(key // factor, total, count)
+        self._compact()
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def to_dict(self):
+        """Medias de cada tramo en orden (lista, para el gráfico del reporte)"""
+        return [total / count for _, (total, count) in sorted(self.buckets.items())]
+
+
+def configured_top_k():
+    """(modo, capacidad) de ANALYSIS_CONFIG['top_k_mode'] y ['top_k_capacity']"""
+    mode = config_value('ANALYSIS_CONFIG', 'top_k_mode', 'exact')
+    capacity = config_value('ANALYSIS_CONFIG', 'top_k_capacity', TOP_K_CAPACITY)
+    return (mode if mode in TOP_K_MODES else 'exact'), capacity
+
+
+class SpaceSaving:
+    """Ranking top-k aproximado en memoria fija (algoritmo Space-Saving)
+
+    Guarda a lo sumo capacity claves. Una clave nueva con el ranking lleno
+    reemplaza a la de menor conteo y hereda ese conteo como error, así que
+    cada conteo estimado sobreestima el real en a lo sumo su error, y ningún
+    error supera total / capacity. Se usa como un Counter: update(),
+    ranking[clave] += n y most_common().
+    """
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # Montículo (conteo, clave) para hallar la mínima; los conteos solo
+        # crecen, así que una entrada puede quedar desactualizada (menor)
+        self._heap = []
+
+    def add(self, key, count=1):
+        if count <= 0:
+            return
+        self.total += count
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+        if len(counts) < self.capacity:
+            floor = 0
+        else:
+            victim, floor = self._pop_min()
+            del counts[victim]
+            del self.errors[victim]
+        counts[key] = floor + count
+        self.errors[key] = floor
+        heapq.heappush(self._heap, (counts[key], key))
+
+    def _pop_min(self):
+        """Quita del montículo la clave de menor conteo actual"""
+        heap = self._heap
+        counts = self.counts
+        while True:
+            count, key = heapq.heappop(heap)
+            current = counts.get(key)
+            if current == count:
+                return key, count
+            if current is not None:
+                heapq.heappush(heap, (current, key))
+
+    def update(self, items):
+        """Cuenta cada elemento del iterable (o suma un diccionario de conteos)"""
+        if isinstance(items, dict):
+            for key, count in items.items():
+                self.add(key, count)
+            return
+        counts = self.counts
+        for key in items:
+            if key in counts:
+                counts[key] += 1
+                self.total += 1
+            else:
+                self.add(key)
+
+    def __getitem__(self, key):
+        return self.counts.get(key, 0)
+
+    def __setitem__(self, key, value):
+        # Permite ranking[clave] += n como en un Counter
+        self.add(key, value - self.counts.get(key, 0))
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def __len__(self):
+        return len(self.counts)
+
+    def merge(self, other):
+        """Fusiona otro ranking (resumen fusionable de Agarwal et al.)
+
+        Una clave que falta en un ranking lleno pudo tener hasta su conteo
+        mínimo: se suma a la estimación y al error. Luego se conservan las
+        capacity claves de mayor conteo.
+        """
+        floor = self._floor()
+        other_floor = other._floor()
+        merged = {}
+        for key in self.counts.keys() | other.counts.keys():
+            merged[key] = (
+                self.counts.get(key, floor) + other.counts.get(key, other_floor),
+                self.errors.get(key, floor) + other.errors.get(key, other_floor)
+            )
+        if len(merged) > self.capacity:
+            merged = dict(heapq.nlargest(self.capacity, merged.items(), key=lambda item: item[1][0]))
+        self.counts = {key: count for key, (count, _) in merged.items()}
+        self.errors = {key: error for key, (_, error) in merged.items()}
+        self.total += other.total
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def _floor(self):
+        """Conteo máximo posible de una clave no guardada"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def most_common(self, n=None):
+        """Las n claves de mayor conteo estimado [(clave, conteo), ...]"""
+        if n is None:
+            return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def error(self, key):
+        """Sobreestimación máxima del conteo de key"""
+        return self.errors.get(key, self._floor())
+
+    def error_bounds(self, n):
+        """Cotas de error del top-n para las estadísticas
+
+        guaranteed es cuántas de las primeras claves tienen un conteo mínimo
+        (estimado - error) que supera al estimado de la siguiente: su lugar
+        en el top-n es seguro.
+        """
+        top = self.most_common(n + 1)
+        following = top[n][1] if len(top) > n else self._floor()
+        guaranteed = 0
+        for key, count in top[:n]:
+            if count - self.errors[key] < following:
+                break
+            guaranteed += 1
+        return {
+            'mode': 'approximate',
+            'capacity': self.capacity,
+            'total': self.total,
+            'max_error': max((self.errors[key] for key, _ in top[:n]), default=0),
+            'error_bound': self.total / self.capacity,
+            'guaranteed': guaranteed,
+            'errors': {key: self.errors[key] for key, _ in top[:n] if self.errors[key]}
+        }
+
+    def to_dict(self):
+        return dict(self.most_common())
+
+
+STREAMING_TYPES = (RunningStats, Histogram, QuantileSketch, Distribution, SequenceSeries, SpaceSaving)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Generador de exports sintéticos
+Genera un conversations.json con la forma del export real (mapping con
+ramas, roles, create_time, partes no textuales) a la escala que se pida.
+Con la misma semilla el archivo es idéntico byte a byte, así que sirve para
+medir el rendimiento sin compartir exports reales.
+"""
+
+import json
+import random
+import uuid
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from export_archive import CONVERSATIONS_NAME
+
+DEFAULT_CONVERSATIONS = 10_000
+DEFAULT_SEED = 42
+
+# Rango de fechas de las conversaciones
+START_TIME = datetime(2022, 12, 1).timestamp()
+END_TIME = datetime(2025, 6, 30).timestamp()
+
+# Probabilidades por turno
+BRANCH_PROBABILITY = 0.12   # respuesta regenerada (rama alternativa)
+EDIT_PROBABILITY = 0.05     # mensaje del usuario editado
+CODE_PROBABILITY = 0.25     # bloque de código en la respuesta
+EMOJI_PROBABILITY = 0.15
+URL_PROBABILITY = 0.08
+ATTACHMENT_PROBABILITY = 0.03  # parte no textual (imagen) en el mensaje
+
+VOCABULARY = {
+    'es': ("hola gracias por favor ayuda cómo puedo hacer esto función error código datos "
+           "archivo servidor necesito explicar ejemplo mejor rápido problema solución pregunta "
+           "proyecto aprender entender sistema usuario tabla consulta").split(),
+    'en': ("hello thanks please help how can i do this function error code data file server "
+           "need explain example better fast problem solution question project learn understand "
+           "system user table query deploy").split(),
+    'pt': ("olá obrigado por favor ajuda como posso fazer isso função erro código dados arquivo "
+           "servidor preciso explicar exemplo melhor problema solução").split(),
+    'fr': ("bonjour merci s'il vous plaît aide comment faire cette fonction erreur code données "
+           "fichier serveur besoin expliquer exemple mieux problème solution").split(),
+    'de': ("hallo danke bitte hilfe wie kann ich das machen funktion fehler code daten datei "
+           "server brauche erklären beispiel besser problem lösung").split(),
+}
+LANGUAGE_WEIGHTS = {'es': 45, 'en': 35, 'pt': 8, 'fr': 6, 'de': 6}
+
+TECH_TERMS = ("python javascript sql rust docker api react pandas numpy git kubernetes "
+              "typescript linux bash regex json http cache thread async").split()
+
+EMOJIS = ['😀', '😂', '🙏', '🚀', '🔥', '👍', '🤔', '✅', '💡', '🎉', '❤️', '😅']
+
+CODE_SNIPPETS = (
+    "```python\ndef main():\n    data = load()\n    return [x * 2 for x in data]\n```",
+    "```javascript\nconst result = items.filter(x => x.active).map(x => x.id);\n```",
+    "```sql\nSELECT user_id, COUNT(*) FROM messages GROUP BY user_id ORDER BY 2 DESC;\n```",
+    "```rust\nfn main() {\n    let v: Vec<i32> = (0..10).collect();\n    println!(\"{:?}\", v);\n}\n```",
+    "```bash\ndocker compose up -d && docker ps\n```",
+)
+
+
+class SyntheticExport:
+    """Generador determinista de conversaciones con la forma del export"""
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.rng = random.Random(seed)
+        self._languages = list(LANGUAGE_WEIGHTS)
+        self._weights = list(LANGUAGE_WEIGHTS.values())
+
+    def _uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _sentence(self, language, words):
+        rng = self.rng
+        vocabulary = VOCABULARY[language]
+        tokens = [rng.choice(TECH_TERMS) if rng.random() < 0.1 else rng.choice(vocabulary)
+                  for _ in range(words)]
+        if rng.random() < EMOJI_PROBABILITY:
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(EMOJIS))
+        if rng.random() < URL_PROBABILITY:
+            tokens.append(f"https://example.com/{rng.choice(TECH_TERMS)}/{rng.randrange(1000)}")
+        text = ' '.join(tokens)
+        return text[:1].upper() + text[1:] + rng.choice(('.', '?', '!', '.'))
+
+    def _text(self, language, role):
+        rng = self.rng
+        if role == 'user':
+            text = self._sentence(language, rng.randint(3, 40))
+        else:
+            text = ' '.join(self._sentence(language, rng.randint(8, 40))
+                            for _ in range(rng.randint(1, 6)))
+            if rng.random() < CODE_PROBABILITY:
+                text += '\n\n' + rng.choice(CODE_SNIPPETS)
+        return text
+
+    def _node(self, mapping, parent_id, role, language, timestamp):
+        node_id = self._uuid()
+        parts = [self._text(language, role)]
+        if self.rng.random() < ATTACHMENT_PROBABILITY:
+            parts.insert(0, {
+                'content_type': 'image_asset_pointer',
+                'asset_pointer': f"file-service://file-{self._uuid()}",
+                'size_bytes': self.rng.randint(10_000, 2_000_000)
+            })
+        mapping[node_id] = {
+            'id': node_id,
+            'message': {
+                'id': node_id,
+                'author': {'role': role, 'name': None, 'metadata': {}},
+                'create_time': timestamp,
+                'update_time': None,
+                'content': {
+                    'content_type': 'multimodal_text' if len(parts) > 1 else 'text',
+                    'parts': parts
+                },
+                'status': 'finished_successfully',
+                'end_turn': role == 'assistant' or None,
+                'weight': 1.0,
+                'metadata': {},
+                'recipient': 'all'
+            },
+            'parent': parent_id,
+            'children': []
+        }
+        mapping[parent_id]['children'].append(node_id)
+        return node_id
+
+    def conversation(self):
+        """Una conversación con mapping ramificado (regeneraciones y ediciones)"""
+        rng = self.rng
+        language = rng.choices(self._languages, self._weights)[0]
+        create_time = rng.uniform(START_TIME, END_TIME)
+        timestamp = create_time
+
+        root_id = self._uuid()
+        mapping = {root_id: {'id': root_id, 'message': None, 'parent': None, 'children': []}}
+        parent_id = root_id
+
+        for _ in range(rng.choices((1, 2, 3, 5, 8, 15, 40), (20, 25, 20, 15, 10, 7, 3))[0]):
+            timestamp += rng.uniform(5, 600)
+            if rng.random() < EDIT_PROBABILITY:
+                # Versión original del mensaje, abandonada al editarlo
+                self._node(mapping, parent_id, 'user', language, timestamp)
+                timestamp += rng.uniform(5, 120)
+            user_id = self._node(mapping, parent_id, 'user', language, timestamp)
+
+            timestamp += rng.uniform(2, 60)
+            if rng.random() < BRANCH_PROBABILITY:
+                # Respuesta regenerada: la primera queda como rama sin continuar
+                self._node(mapping, user_id, 'assistant', language, timestamp)
+                timestamp += rng.uniform(2, 60)
+            parent_id = self._node(mapping, user_id, 'assistant', language, timestamp)
+
+        conv_id = self._uuid()
+        return {
+            'title': self._sentence(language, rng.randint(2, 6))[:-1],
+            'create_time': create_time,
+            'update_time': timestamp,
+            'mapping': mapping,
+            'moderation_results': [],
+            'current_node': parent_id,
+            'plugin_ids': None,
+            'conversation_id': conv_id,
+            'id': conv_id
+        }
+
+    def conversations(self, count):
+        for _ in range(count):
+            yield self.conversation()
+
+
+def write_export(path, count=DEFAULT_CONVERSATIONS, seed=DEFAULT_SEED, as_zip=False):
+    """Escribe count conversaciones en path (JSON o ZIP del export)
+
+    Se escriben una a una, así que la memoria no depende de count.
+    Devuelve el número de mensajes generados.
+    """
+    path = Path(path)
+    generator = SyntheticExport(seed)
+    messages = 0
+
+    def write(stream):
+        nonlocal messages
+        stream.write(b'[')
+        for index, conversation in enumerate(generator.conversations(count)):
+            if index:
+                stream.write(b',\n')
+            messages += len(conversation['mapping']) - 1
+            stream.write(json.dumps(conversation, ensure_ascii=False).encode('utf-8'))
+        stream.write(b']')
+
+    if as_zip:
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            with zf.open(CONVERSATIONS_NAME, 'w', force_zip64=True) as stream:
+                write(stream)
+    else:
+        with open(path, 'wb') as stream:
+            write(stream)
+    return messages
+
+
+def main():
+    """Función principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ChatGPT Analytics Pro - Export sintético")
+    parser.add_argument("--conversations", type=int, default=DEFAULT_CONVERSATIONS,
+                        help=f"Número de conversaciones (por defecto {DEFAULT_CONVERSATIONS})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla (mismo archivo con la misma semilla)")
+    parser.add_argument("--output", default="conversations.json", help="Archivo de salida")
+    parser.add_argument("--zip", action="store_true", help="Escribir un ZIP de export en lugar de JSON")
+
+    args = parser.parse_args()
+
+    print(f"🧪 Generando {args.conversations} conversaciones (semilla {args.seed})...")
+    messages = write_export(args.output, args.conversations, args.seed, args.zip)
+    print(f"✅ {messages} mensajes escritos en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
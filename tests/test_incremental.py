@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Pruebas del modo incremental
+Un re-export con conversaciones nuevas al principio mueve de posición a las
+que ya estaban en la caché; el resultado debe ser igual al de un análisis
+completo.
+"""
+
+import io
+import json
+import math
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chatgpt_parser import ChatGPTParser  # noqa: E402
+from synthetic_export import SyntheticExport  # noqa: E402
+
+CONVERSATIONS = 120
+ADDED_AT_START = 20
+
+
+def assert_same_stats(test, expected, actual, path='stats'):
+    """Compara estadísticas admitiendo el redondeo de las sumas fusionadas"""
+    if isinstance(expected, float) or isinstance(actual, float):
+        test.assertTrue(math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-12),
+                        f"{path}: {expected!r} != {actual!r}")
+    elif isinstance(expected, dict):
+        test.assertEqual(sorted(expected), sorted(actual), path)
+        for key in expected:
+            assert_same_stats(test, expected[key], actual[key], f"{path}[{key!r}]")
+    elif isinstance(expected, (list, tuple)):
+        test.assertEqual(len(expected), len(actual), path)
+        for index, (a, b) in enumerate(zip(expected, actual)):
+            assert_same_stats(test, a, b, f"{path}[{index}]")
+    else:
+        test.assertEqual(expected, actual, path)
+
+
+class IncrementalReexportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.conversations = list(SyntheticExport(seed=7).conversations(CONVERSATIONS))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def analyze(self, conversations, **options):
+        (self.dir / 'conversations.json').write_text(json.dumps(conversations), encoding='utf-8')
+        parser = ChatGPTParser(self.dir, sentiment_backend='lexicon', write_index=False,
+                               search_index=False, max_conversations=0, **options)
+        with redirect_stdout(io.StringIO()):
+            stats = parser.process_conversations()
+        return json.loads(json.dumps(stats, default=dict))
+
+    def check_reexport(self, jobs):
+        cache_path = self.dir / f'stats_{jobs}.cache.sqlite'
+        self.analyze(self.conversations[ADDED_AT_START:], cache_path=cache_path, jobs=jobs)
+        incremental = self.analyze(self.conversations, cache_path=cache_path, jobs=jobs)
+        full = self.analyze(self.conversations)
+
+        self.assertTrue(incremental['sentiment_scores'])
+        assert_same_stats(self, full, incremental)
+
+    def test_conversations_added_at_start(self):
+        self.check_reexport(jobs=1)
+
+    def test_conversations_added_at_start_parallel(self):
+        self.check_reexport(jobs=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Búsqueda de términos en una sola pasada
+Detecta términos técnicos, lenguajes, palabras clave y patrones de interacción
+con un único recorrido del texto, respetando límites de palabra
+"""
+
+import re
+
+from settings import config_section
+from text_normalizer import tokenize
+
+# Listas por defecto. Cada categoría es una lista de términos o un dict
+# etiqueta -> frases que la activan (para sinónimos y términos ambiguos).
+DEFAULT_TERM_LISTS = {
+    'technical_terms': [
+        'algorithm', 'database', 'api', 'framework', 'library', 'function',
+        'variable', 'class', 'object', 'method', 'array', 'string',
+        'integer', 'boolean', 'loop', 'condition', 'recursion', 'debugging',
+        'testing', 'deployment', 'server', 'client', 'frontend', 'backend',
+        'fullstack', 'devops', 'docker', 'kubernetes', 'aws', 'azure',
+        'machine learning', 'artificial intelligence', 'neural network',
+        'deep learning', 'data science', 'analytics', 'visualization'
+    ],
+    'programming_languages': {
+        'python': ['python'],
+        'javascript': ['javascript'],
+        'java': ['java'],
+        'c++': ['c++'],
+        'c#': ['c#'],
+        'php': ['php'],
+        'ruby': ['ruby'],
+        # "go" y "r" son palabras comunes: solo cuentan en formas inequívocas
+        'go': ['golang', 'go lang', 'go language', 'lenguaje go'],
+        'rust': ['rust'],
+        'swift': ['swift'],
+        'kotlin': ['kotlin'],
+        'typescript': ['typescript'],
+        'html': ['html'],
+        'css': ['css'],
+        'sql': ['sql'],
+        'r': ['rstats', 'rstudio', 'r language', 'r programming', 'lenguaje r'],
+        'matlab': ['matlab'],
+        'scala': ['scala'],
+        'perl': ['perl'],
+        'bash': ['bash'],
+        'powershell': ['powershell']
+    },
+    'interaction_patterns': {
+        'gratitud': ['gracias', 'thank you', 'thanks'],
+        'cortesía': ['por favor', 'please'],
+        'explicación': ['explica', 'explicar', 'explícame', 'explicame', 'explain', 'explaining', 'explanation'],
+        'ayuda': ['ayuda', 'ayudar', 'ayúdame', 'ayudame', 'help', 'helping']
+    },
+    'topics': [
+        'python', 'javascript', 'react', 'node', 'api', 'database', 'sql',
+        'html', 'css', 'git', 'github', 'docker', 'kubernetes', 'aws',
+        'machine learning', 'ai', 'neural', 'algorithm', 'data',
+        'frontend', 'backend', 'fullstack', 'devops', 'deployment'
+    ]
+}
+
+
+class TermMatcher:
+    """Autómata de términos sobre palabras: un recorrido por mensaje
+
+    Los términos de una palabra se resuelven con una intersección de
+    conjuntos y las frases de varias palabras se comprueban solo en las
+    posiciones donde aparece su primera palabra.
+    """
+
+    def __init__(self, term_lists):
+        self.single = {}
+        self.multi = {}
+
+        for category, terms in term_lists.items():
+            if isinstance(terms, dict):
+                entries = terms.items()
+            else:
+                entries = ((term, [term]) for term in terms)
+
+            for label, phrases in entries:
+                for phrase in phrases:
+                    words = tuple(tokenize(phrase.lower()))
+                    if not words:
+                        continue
+                    hit = (category, label)
+                    if len(words) == 1:
+                        self.single.setdefault(words[0], set()).add(hit)
+                    else:
+                        self.multi.setdefault(words[0], {}).setdefault(words, set()).add(hit)
+
+        self._single_keys = frozenset(self.single)
+        self._multi_keys = frozenset(self.multi)
+
+    def match_tokens(self, tokens):
+        """Devuelve el conjunto de (categoría, etiqueta) presentes en las palabras"""
+        found = set()
+        for token in self._single_keys.intersection(tokens):
+            found |= self.single[token]
+
+        starts = self._multi_keys.intersection(tokens)
+        if starts:
+            for i, token in enumerate(tokens):
+                if token in starts:
+                    for words, hits in self.multi[token].items():
+                        if tuple(tokens[i:i + len(words)]) == words:
+                            found |= hits
+        return found
+
+    def match(self, text):
+        """Igual que match_tokens, a partir del texto original"""
+        return self.match_tokens(tokenize(text.lower()))
+
+
+def load_term_lists(overrides=None):
+    """Combina las listas por defecto con las de TERMS_CONFIG (config.py)"""
+    if overrides is None:
+        overrides = config_section('TERMS_CONFIG')
+
+    term_lists = dict(DEFAULT_TERM_LISTS)
+    for category, terms in (overrides or {}).items():
+        if terms is not None:
+            term_lists[category] = terms
+    return term_lists
+
+
+_default_matcher = None
+
+
+def get_term_matcher():
+    """Matcher compartido construido con la configuración actual"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = TermMatcher(load_term_lists())
+    return _default_matcher
+
+
+# URLs, emojis y acentos en una sola expresión (un recorrido por mensaje)
+FEATURE_PATTERN = re.compile(
+    r'(?P<url>http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+)'
+    r'|(?P<emoji>[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF])'
+    r'|(?P<accent>[áéíóúñüÁÉÍÓÚÑÜ])'
+)
+
+
+def scan_text_features(text):
+    """Cuenta URLs, lista emojis y detecta acentos españoles en una pasada
+
+    Devuelve (número de URLs, lista de emojis, hay_acentos).
+    """
+    url_count = 0
+    emojis = []
+    has_accent = False
+    for match in FEATURE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'url':
+            url_count += 1
+        elif kind == 'emoji':
+            emojis.append(match.group())
+        else:
+            has_accent = True
+    return url_count, emojis, has_accent
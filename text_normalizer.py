@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Normalización de texto compartida
+Cada mensaje se pasa a minúsculas y se tokeniza una sola vez; el mismo flujo
+de tokens alimenta frecuencia de palabras, palabras clave, lenguajes y longitudes
+"""
+
+import re
+
+from nlp_support import nltk_stopwords
+
+# Palabras: letras/dígitos, con sufijos de lenguaje como "c++" o "c#"
+TOKEN_PATTERN = re.compile(r"\w+(?:\+\+|#)?")
+
+# Stopwords básicas para cuando NLTK no está disponible o está desactivado
+BASIC_STOP_WORDS = frozenset("""
+a al algo como con de del el ella en entre era es esa ese eso esta este esto
+fue ha hay la las le les lo los me mi muy más no nos o para pero por porque
+que qué se si sin sobre su sus también te tu un una uno y ya yo
+about all an and are as at be but by can do for from had has have he her his
+how i if in into is it its me my no not of on or our she so that the their
+them then there these they this to was we were what when which who will with
+would you your
+""".split())
+
+_stop_words = {}
+
+
+def tokenize(text_lower):
+    """Divide un texto (ya en minúsculas) en tokens"""
+    return TOKEN_PATTERN.findall(text_lower)
+
+
+def get_stop_words(use_nltk=True):
+    """Stopwords de español e inglés, construidas una sola vez por proceso
+
+    Con use_nltk=False (o sin NLTK) se usan las stopwords básicas.
+    """
+    if use_nltk not in _stop_words:
+        words = nltk_stopwords() if use_nltk else None
+        _stop_words[use_nltk] = frozenset(words) if words else BASIC_STOP_WORDS
+    return _stop_words[use_nltk]
+
+
+class MessageText:
+    """Texto de un mensaje normalizado una sola vez"""
+
+    __slots__ = ('text', 'word_count', 'tokens')
+
+    def __init__(self, text):
+        self.text = text
+        # Palabras separadas por espacios (solo se guarda la cantidad)
+        self.word_count = len(text.split())
+        # Tokens en minúsculas (para frecuencia, términos y lenguajes)
+        self.tokens = tokenize(text.lower())
+
+    @property
+    def char_length(self):
+        return len(self.text)
+
+    def content_tokens(self, min_length=3, stop_words=None):
+        """Tokens de al menos min_length caracteres que no son stopwords"""
+        if stop_words is None:
+            stop_words = get_stop_words()
+        return [token for token in self.tokens if len(token) >= min_length and token not in stop_words]
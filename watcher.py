@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ChatGPT Analytics Pro - Modo watch
+Vigila data_dir y, cuando aparece o cambia conversations.json o un ZIP del
+export, vuelve a analizar en modo incremental (solo las conversaciones nuevas
+o modificadas). Cada etapa se avisa con un evento; server.py --watch los
+reenvía a los reportes abiertos por Server-Sent Events.
+"""
+
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from export_archive import CONVERSATIONS_NAME, is_export_zip
+
+# Segundos entre revisiones del directorio
+POLL_INTERVAL = 2.0
+
+
+def snapshot(data_dir):
+    """{ruta: (tamaño, mtime_ns)} de conversations.json y los ZIP de data_dir"""
+    data_dir = Path(data_dir)
+    signatures = {}
+    for path in [data_dir / CONVERSATIONS_NAME, *sorted(data_dir.glob('*.zip'))]:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signatures[path] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+
+def changed_source(before, after):
+    """Origen a re-analizar entre dos snapshots (o None)
+
+    conversations.json tiene prioridad, igual que en ChatGPTParser; entre
+    varios ZIP nuevos se toma el más reciente.
+    """
+    changed = [path for path, signature in after.items() if before.get(path) != signature]
+    if not changed:
+        return None
+    for path in changed:
+        if path.name == CONVERSATIONS_NAME:
+            return path
+    zips = [path for path in changed if is_export_zip(path)]
+    return max(zips, key=lambda path: after[path][1]) if zips else None
+
+
+class ExportWatcher:
+    """Hilo que re-analiza el export cuando cambia
+
+    on_event(evento, datos) recibe 'analysis-started', 'stats-updated' y
+    'analysis-failed'. Un archivo se analiza cuando deja de cambiar entre
+    dos revisiones (copia o descarga terminada).
+    """
+
+    def __init__(self, data_dir=".", on_event=None, interval=POLL_INTERVAL, nlp=True, jobs=1,
+                 roles=None, output_file="chatgpt_stats.json"):
+        self.data_dir = Path(data_dir)
+        self.on_event = on_event
+        self.interval = interval
+        self.nlp = nlp
+        self.jobs = jobs
+        # Roles analizados (None = todos, como chatgpt_parser.py; setup.py usa solo 'user')
+        self.roles = roles
+        self.output_file = output_file
+        self.cache_path = self.data_dir / (Path(output_file).stem + '.cache.sqlite')
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='export-watcher', daemon=True)
+        self._thread.start()
+        print(f"👀 Vigilando {self.data_dir.resolve()} (cada {self.interval:g}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _emit(self, event, data):
+        if self.on_event:
+            self.on_event(event, data)
+
+    def _run(self):
+        analyzed = last_seen = snapshot(self.data_dir)
+        while not self._stop.wait(self.interval):
+            current = snapshot(self.data_dir)
+            if current != last_seen:
+                # Todavía cambiando: se espera a la siguiente revisión
+                last_seen = current
+                continue
+            if current == analyzed:
+                continue
+            source = changed_source(analyzed, current)
+            analyzed = current
+            if source is not None:
+                self.analyze(source)
+
+    def analyze(self, source):
+        """Re-analiza source (conversations.json o ZIP) con la caché incremental"""
+        from chatgpt_parser import ChatGPTParser
+
+        source = Path(source)
+        is_zip = source.suffix.lower() == '.zip'
+        print(f"🔄 Cambio detectado en {source.name}: re-analizando...")
+        self._emit('analysis-started', {'source': str(source)})
+
+        start = time.perf_counter()
+        try:
+            parser = ChatGPTParser(self.data_dir, stream=True, zip_path=source if is_zip else None,
+                                   jobs=self.jobs, cache_path=self.cache_path, nlp=self.nlp, roles=self.roles)
+            stats = parser.process_conversations()
+            output_path = parser.save_stats(self.output_file)
+        except Exception as e:
+            traceback.print_exc()
+            print(f"❌ Error re-analizando {source.name}: {e}")
+            self._emit('analysis-failed', {'source': str(source), 'error': f"{type(e).__name__}: {e}"})
+            return None
+
+        data = {
+            'source': str(source),
+            'zip': str(source) if is_zip else None,
+            'output': output_path.name,
+            'conversations': stats['total_conversations'],
+            'messages': stats['total_messages'],
+            'seconds': round(time.perf_counter() - start, 2),
+            'generated_at': datetime.now().isoformat(timespec='seconds')
+        }
+        print(f"✅ Estadísticas actualizadas ({data['conversations']} conversaciones en {data['seconds']}s)")
+        self._emit('stats-updated', data)
+        return data